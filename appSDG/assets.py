@@ -0,0 +1,87 @@
+"""
+Icon asset layer.
+
+Each icon is resized once per process to the size it is displayed at
+(times PIXEL_RATIO for high-DPI screens), palette-compressed and written to
+static/icons/ under a content-hashed name, which Streamlit serves at
+app/static/icons/ when server.enableStaticServing is on (see
+.streamlit/config.toml). The page then only carries a short URL the browser
+can cache. Without static serving the small variant is inlined as a data URI.
+"""
+import base64
+import hashlib
+import io
+import os
+
+import streamlit as st
+from PIL import Image
+
+from utils_constants import ICON_URLS
+
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+ASSET_DIR = os.path.join(APP_DIR, "assets")
+STATIC_DIR = os.path.join(APP_DIR, "static", "icons")
+STATIC_URL = "app/static/icons"
+
+# Variants are rendered at this multiple of their CSS width
+PIXEL_RATIO = 2
+
+
+def variant_bytes(file_path, width):
+    """
+    PNG bytes of the image scaled to width * PIXEL_RATIO pixels (never
+    upscaled) and reduced to a 256-colour palette.
+    """
+    with Image.open(file_path) as img:
+        target = min(img.width, width * PIXEL_RATIO)
+        height = max(1, round(img.height * target / img.width))
+        resized = img.convert("RGB").resize((target, height), Image.LANCZOS)
+    resized = resized.quantize(256, method=Image.Quantize.FASTOCTREE)
+    buf = io.BytesIO()
+    resized.save(buf, format="PNG", optimize=True)
+    return buf.getvalue()
+
+
+def publish(file_path, width, data):
+    """
+    Writes a variant to STATIC_DIR as <stem>_<width>w.<hash>.png (if not
+    already there), drops older variants of the same size and returns its name.
+    """
+    prefix = f"{os.path.splitext(os.path.basename(file_path))[0]}_{width}w."
+    name = f"{prefix}{hashlib.sha256(data).hexdigest()[:12]}.png"
+    path = os.path.join(STATIC_DIR, name)
+    if not os.path.exists(path):
+        os.makedirs(STATIC_DIR, exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+
+        for old in os.listdir(STATIC_DIR):
+            if old.startswith(prefix) and old != name:
+                try:
+                    os.remove(os.path.join(STATIC_DIR, old))
+                except OSError:
+                    pass
+    return name
+
+
+@st.cache_resource(show_spinner=False)
+def icon_src(key, width):
+    """
+    Returns an <img> src for ICON_URLS[key] displayed at `width` CSS pixels:
+    a static URL when static serving is enabled, else a data URI.
+    Computed once per process for each (icon, width).
+    """
+    file_path = os.path.join(ASSET_DIR, os.path.basename(ICON_URLS[key]))
+    try:
+        data = variant_bytes(file_path, width)
+    except OSError:
+        return ""
+
+    if st.get_option("server.enableStaticServing"):
+        try:
+            return f"{STATIC_URL}/{publish(file_path, width, data)}"
+        except OSError:
+            pass
+    return "data:image/png;base64," + base64.b64encode(data).decode()
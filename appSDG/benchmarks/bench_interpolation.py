@@ -0,0 +1,103 @@
+"""
+Benchmarks the gap-filling step of `load_data` against the previous
+per-country grid + groupby/lambda interpolation, and checks both agree.
+
+Usage (from the appSDG folder):
+    python benchmarks/bench_interpolation.py [--countries 250] [--indicators 200] [--years 25]
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from data_loader import fill_year_grid, to_dense  # noqa: E402
+from interpolation import fill_gaps  # noqa: E402
+
+
+def legacy_fill(df, years):
+    """The step-8 implementation that fill_year_grid replaced."""
+    df_pivot = df.pivot(
+        index=["GeoAreaName", "TimePeriod"], columns="Indicator", values="Value"
+    ).reset_index()
+
+    countries = df_pivot["GeoAreaName"].unique()
+    grid = []
+    for country in countries:
+        for year in years:
+            grid.append({"GeoAreaName": country, "TimePeriod": year})
+    df_grid = pd.DataFrame(grid)
+
+    df_merged = pd.merge(df_grid, df_pivot, on=["GeoAreaName", "TimePeriod"], how="left")
+    indicator_cols = [c for c in df_merged.columns if c not in ["GeoAreaName", "TimePeriod"]]
+    df_interpolated = df_merged.copy()
+    df_interpolated[indicator_cols] = df_merged.groupby("GeoAreaName")[
+        indicator_cols
+    ].transform(lambda x: x.interpolate(method="linear", limit_direction="both"))
+
+    return df_interpolated.melt(
+        id_vars=["GeoAreaName", "TimePeriod"], var_name="Indicator", value_name="Value"
+    ).dropna(subset=["Value"])
+
+
+def make_series(n_countries, n_indicators, n_years, missing=0.4, seed=0):
+    """Deduplicated long frame with random year gaps, like step 7's output."""
+    rng = np.random.default_rng(seed)
+    years = np.arange(2000, 2000 + n_years)
+    countries = np.array([f"Country {i:03d}" for i in range(n_countries)], dtype=object)
+    indicators = np.array([f"{i // 10}.{i % 10}.1 Indicator {i:03d}" for i in range(n_indicators)], dtype=object)
+
+    c, i, y = np.meshgrid(
+        np.arange(n_countries), np.arange(n_indicators), np.arange(n_years), indexing="ij"
+    )
+    keep = rng.random(c.size) >= missing
+    df = pd.DataFrame(
+        {
+            "GeoAreaName": countries[c.ravel()[keep]],
+            "TimePeriod": years[y.ravel()[keep]],
+            "Indicator": indicators[i.ravel()[keep]],
+            "Value": rng.normal(50, 15, keep.sum()),
+        }
+    )
+    return df, range(years[0], years[-1] + 1)
+
+
+def run(n_countries, n_indicators, n_years, repeat):
+    df, years = make_series(n_countries, n_indicators, n_years)
+    print(f"{n_countries} geo areas x {n_indicators} indicators x {n_years} years ({len(df):,} observed cells)")
+
+    timings = {}
+    results = {}
+    for name, fn in (("legacy", legacy_fill), ("vectorised", fill_year_grid)):
+        best = float("inf")
+        for _ in range(repeat):
+            start = time.perf_counter()
+            results[name] = fn(df, years)
+            best = min(best, time.perf_counter() - start)
+        timings[name] = best
+        print(f"  {name:<11} {best * 1000:10.1f} ms")
+
+    _, _, dense = to_dense(df, years)
+    start = time.perf_counter()
+    fill_gaps(dense)
+    print(f"  {'engine only':<11} {(time.perf_counter() - start) * 1000:10.1f} ms  (fill_gaps on {dense.shape})")
+
+    legacy = results["legacy"]
+    pd.testing.assert_frame_equal(
+        results["vectorised"], legacy.set_axis(legacy.index.astype("int64")), check_exact=True
+    )
+    print(f"  identical output, speedup {timings['legacy'] / timings['vectorised']:.1f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--countries", type=int, default=250)
+    parser.add_argument("--indicators", type=int, default=200)
+    parser.add_argument("--years", type=int, default=25)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    run(args.countries, args.indicators, args.years, args.repeat)
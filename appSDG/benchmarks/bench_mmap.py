@@ -0,0 +1,101 @@
+"""
+Per-process memory of a memory-mapped cube versus a private in-memory copy.
+
+Usage (from the appSDG folder, Linux only):
+    python benchmarks/bench_mmap.py [--processes 1 2 4 8] [--indicators 2000] [--countries 250] [--years 25]
+
+Writes a synthetic cube with SDGCube.save, then starts N processes that each
+open it (mapped) or np.load it (copied), read every value and report their
+RSS and PSS (proportional set size: shared pages are split between the
+processes mapping them) while all N are alive.
+"""
+import argparse
+import multiprocessing
+import os
+import sys
+import tempfile
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from cube import SDGCube  # noqa: E402
+
+
+def _memory_kb():
+    usage = {}
+    with open("/proc/self/smaps_rollup") as f:
+        for line in f:
+            key, _, rest = line.partition(":")
+            if key in ("Rss", "Pss"):
+                usage[key] = int(rest.split()[0])
+    return usage
+
+
+def _worker(path, mapped, barrier, results):
+    if mapped:
+        cube = SDGCube.open(path)
+    else:
+        cube = SDGCube(np.load(path), *_axes(path))
+    cube.values.sum()  # touch every page without temporaries
+    barrier.wait()
+    results.put(_memory_kb())
+    barrier.wait()
+
+
+def _axes(path):
+    cube = SDGCube.open(path)
+    return cube.indicators, cube.countries, cube.years, cube.regions
+
+
+def _make_cube(path, n_indicators, n_countries, n_years):
+    rng = np.random.default_rng(0)
+    values = rng.uniform(0, 100, (n_indicators, n_countries, n_years))
+    values[rng.random(values.shape) < 0.2] = np.nan
+    SDGCube(
+        values,
+        [f"Indicator {i}" for i in range(n_indicators)],
+        [f"Country {c}" for c in range(n_countries)],
+        np.arange(2000, 2000 + n_years),
+        ["Other"] * n_countries,
+    ).save(path)
+    return values.nbytes
+
+
+def run(processes, n_indicators, n_countries, n_years):
+    context = multiprocessing.get_context("spawn")
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "cube.npy")
+        nbytes = _make_cube(path, n_indicators, n_countries, n_years)
+        print(f"cube: {nbytes / 1e6:.1f} MB")
+        print(f"{'procs':>6} {'mode':>7} {'RSS/proc (MB)':>14} {'PSS/proc (MB)':>14} {'PSS total (MB)':>15}")
+        for n in processes:
+            for mapped in (False, True):
+                barrier = context.Barrier(n)
+                results = context.Queue()
+                workers = [
+                    context.Process(target=_worker, args=(path, mapped, barrier, results))
+                    for _ in range(n)
+                ]
+                for w in workers:
+                    w.start()
+                usage = [results.get() for _ in workers]
+                for w in workers:
+                    w.join()
+
+                rss = np.mean([u["Rss"] for u in usage]) / 1024
+                pss = [u["Pss"] / 1024 for u in usage]
+                print(
+                    f"{n:>6} {'mmap' if mapped else 'copy':>7} {rss:>14.1f} "
+                    f"{np.mean(pss):>14.1f} {sum(pss):>15.1f}"
+                )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--processes", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--indicators", type=int, default=2000)
+    parser.add_argument("--countries", type=int, default=250)
+    parser.add_argument("--years", type=int, default=25)
+    args = parser.parse_args()
+    run(args.processes, args.indicators, args.countries, args.years)
@@ -0,0 +1,77 @@
+"""
+Scaling curves for the process-pool pipeline against the serial one.
+
+Usage (from the appSDG folder):
+    python benchmarks/bench_parallel.py [--workers 1 2 4 8] [--scales 10 100] [--by country]
+
+Each scale replicates the raw rows of SDG_final.csv that many times (values
+jittered so the duplicates really are averaged) into a temporary file. Every
+parallel result is checked to be identical to the serial one.
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import data_loader  # noqa: E402
+from parallel import run_parallel  # noqa: E402
+
+
+def _time(fn, repeat):
+    best, result = float("inf"), None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def _parallel_frame(path, workers, by):
+    _, *arrays = run_parallel(path, workers, by=by, years=data_loader.FULL_YEARS)
+    return data_loader.assemble(*data_loader.label_axes(*arrays))
+
+
+def run(scales, workers, by, repeat):
+    source = os.path.join(os.path.dirname(data_loader.__file__), "SDG_final.csv")
+    raw = pd.read_csv(source, dtype={"Value": "str"})
+    rng = np.random.default_rng(0)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        print(f"cpus: {os.cpu_count()}, partitioned by {by}")
+        print(f"{'scale':>6} {'rows':>9} {'workers':>8} {'time (ms)':>10} {'speedup':>8}")
+        for scale in scales:
+            path = os.path.join(tmp, f"SDG_x{scale}.csv")
+            inflated = pd.concat([raw] * scale, ignore_index=True)
+            values = pd.to_numeric(inflated["Value"], errors="coerce")
+            inflated["Value"] = (values * rng.uniform(0.95, 1.05, len(values))).round(3)
+            inflated.to_csv(path, index=False)
+
+            serial, expected = _time(
+                lambda: data_loader.load_processed(path, use_snapshot=False), repeat
+            )
+            print(f"{scale:>6} {len(inflated):>9} {'serial':>8} {serial * 1000:>10.1f} {1:>7.2f}x")
+            for n in workers:
+                elapsed, result = _time(lambda: _parallel_frame(path, n, by), repeat)
+                pd.testing.assert_frame_equal(
+                    result, expected, check_exact=True, check_frame_type=False
+                )
+                print(
+                    f"{scale:>6} {len(inflated):>9} {n:>8} {elapsed * 1000:>10.1f} "
+                    f"{serial / elapsed:>7.2f}x"
+                )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--scales", type=int, nargs="+", default=[10, 100])
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--by", choices=["country", "indicator"], default="country")
+    args = parser.parse_args()
+    run(args.scales, args.workers, args.by, args.repeat)
@@ -0,0 +1,135 @@
+"""
+Measures the bytes Streamlit sends over the websocket, and the time until the
+run finishes, per rerun.
+
+Usage (from the appSDG folder):
+    python benchmarks/bench_payload.py [--root ..] [--port 8765]
+    (--root selects the checkout to serve, default the one containing this file)
+
+Starts `streamlit run appSDG/main.py` in --root, connects like a browser
+(reporting the hashes of cacheable messages it already holds, so repeated
+large elements come back as references) and prints bytes and latency for: the first load, a plain rerun, a country
+change, a year-range change and a goal (theme) change. Changes to widgets drawn
+inside a fragment are sent as fragment reruns, as the browser does.
+Needs the `websockets` package.
+"""
+import argparse
+import asyncio
+import os
+import subprocess
+import sys
+import time
+import urllib.request
+
+import websockets
+from streamlit.proto.BackMsg_pb2 import BackMsg
+from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+from streamlit.proto.WidgetStates_pb2 import WidgetState
+
+
+class Client:
+    def __init__(self, ws):
+        self.ws = ws
+        self.cached = set()
+        self.widgets = {}
+        self.fragments = {}
+
+    async def rerun(self, changes=()):
+        """
+        Sends a rerun with the given (label, field, value) widget changes and
+        returns (bytes received, messages received, seconds) until the run
+        finishes. Only the enclosing fragment reruns when every changed widget
+        belongs to the same one.
+        """
+        msg = BackMsg()
+        state = msg.rerun_script
+        state.cached_message_hashes.extend(sorted(self.cached))
+        fragments = {self.fragments.get(label, "") for label, _, _ in changes}
+        if len(fragments) == 1:
+            state.fragment_id = fragments.pop()
+        for label, field, value in changes:
+            widget = WidgetState(id=self.widgets[label])
+            if isinstance(value, (list, tuple)):
+                getattr(widget, field).data.extend(value)
+            else:
+                setattr(widget, field, value)
+            state.widget_states.widgets.append(widget)
+        start = time.perf_counter()
+        await self.ws.send(msg.SerializeToString())
+
+        received = count = 0
+        while True:
+            frame = await self.ws.recv()
+            received += len(frame)
+            count += 1
+            fwd = ForwardMsg()
+            fwd.ParseFromString(frame)
+            if fwd.metadata.cacheable:
+                self.cached.add(fwd.hash)
+            if fwd.WhichOneof("type") == "delta" and fwd.delta.WhichOneof("type") == "new_element":
+                element = fwd.delta.new_element
+                if element.WhichOneof("type") == "exception":
+                    raise RuntimeError(f"App raised: {element.exception.message}")
+                proto = getattr(element, element.WhichOneof("type"))
+                if hasattr(proto, "label") and hasattr(proto, "id"):
+                    self.widgets[proto.label] = proto.id
+                    self.fragments[proto.label] = fwd.delta.fragment_id
+            if fwd.WhichOneof("type") == "script_finished":
+                return received, count, time.perf_counter() - start
+
+
+async def measure(port):
+    async with websockets.connect(
+        f"ws://127.0.0.1:{port}/_stcore/stream", max_size=None
+    ) as ws:
+        client = Client(ws)
+        steps = [
+            ("first load", ()),
+            ("plain rerun", ()),
+            ("countries", [("Select Countries:", "string_array_value", ["India", "Nepal"])]),
+            ("year range", [("Time Period:", "double_array_value", [2016.0, 2022.0])]),
+            ("goal/theme change", [("Select Goal:", "string_value", "SDG 6")]),
+            ("rerun after theme", [("Select Goal:", "string_value", "SDG 6")]),
+        ]
+        print(f"{'step':<20} {'bytes':>10} {'messages':>9} {'ms':>8}")
+        for name, changes in steps:
+            received, count, seconds = await client.rerun(changes)
+            print(f"{name:<20} {received:>10,} {count:>9} {seconds * 1000:>8.1f}")
+
+
+def _wait_ready(port, timeout=60):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            urllib.request.urlopen(f"http://127.0.0.1:{port}/_stcore/health", timeout=1)
+            return
+        except OSError:
+            time.sleep(0.3)
+    raise RuntimeError("Streamlit server did not start")
+
+
+def run(root, port):
+    server = subprocess.Popen(
+        [
+            sys.executable, "-m", "streamlit", "run", "appSDG/main.py",
+            "--server.headless", "true", "--server.port", str(port),
+        ],
+        cwd=root,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        _wait_ready(port)
+        asyncio.run(measure(port))
+    finally:
+        server.terminate()
+        server.wait()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    default_root = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..")
+    parser.add_argument("--root", default=os.path.normpath(default_root))
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+    run(args.root, args.port)
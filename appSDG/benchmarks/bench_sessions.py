@@ -0,0 +1,234 @@
+"""
+Headless load test of main.py: N concurrent sessions making random sidebar changes.
+
+Usage (from the appSDG folder):
+    python benchmarks/bench_sessions.py [--sessions 1 4 16] [--actions 20] [--think 0]
+        [--seed 0] [--json results.json]
+
+Each session is a Streamlit AppTest of main.py driven from its own thread. It
+changes one of goal, indicator, region, countries or year range to a random
+value and reruns, --actions times, waiting a random 0..2x --think seconds in
+between. Sessions share this process's caches (data, cube, slices, figures)
+like the sessions of one server process.
+
+AppTest swaps process-wide state around every run (the runtime singleton and
+config options), so runs are serialized by a lock, much like script runs that
+hold the GIL in a server process. Latency runs from the request to the end of
+the rerun, including the wait for the lock; service time is the run alone.
+Memory growth is the process RSS gained while the sessions are alive, per
+session. No browser or websocket is involved (see bench_payload.py).
+
+Prints one row per session count; --json writes the results, with the
+environment they were measured in, for tracking capacity over time.
+"""
+import argparse
+import gc
+import json
+import logging
+import os
+import platform
+import random
+import threading
+import time
+from datetime import datetime, timezone
+
+import numpy as np
+import streamlit
+from streamlit.runtime.scriptrunner.script_cache import ScriptCache
+from streamlit.testing.v1 import AppTest, app_test
+
+MAIN_SCRIPT = os.path.join(os.path.dirname(__file__), "..", "main.py")
+
+# Seconds a single rerun may take before it counts as failed
+RUN_TIMEOUT = 120
+
+# (widget kind, label) of the controls the sessions change
+CONTROLS = {
+    "goal": ("radio", "Select Goal:"),
+    "indicator": ("selectbox", "Select Indicator:"),
+    "region": ("radio", "Select Region:"),
+    "countries": ("multiselect", "Select Countries:"),
+    "years": ("slider", "Time Period:"),
+}
+
+# One compiled script for every run, as in a server process (AppTest would
+# otherwise compile main.py again on each run)
+_SCRIPT_CACHE = ScriptCache()
+app_test.ScriptCache = lambda: _SCRIPT_CACHE
+
+_RUN_LOCK = threading.Lock()
+
+
+def _rss_mb():
+    """Resident set size of this process in MB (Linux)."""
+    with open("/proc/self/status") as f:
+        for line in f:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1]) / 1024
+    return float("nan")
+
+
+def _widget(at, control):
+    kind, label = CONTROLS[control]
+    return next(w for w in getattr(at, kind) if w.label == label)
+
+
+def _random_change(at, control, rng):
+    widget = _widget(at, control)
+    if control == "countries":
+        widget.set_value(rng.sample(widget.options, rng.randint(1, len(widget.options))))
+    elif control == "years":
+        low, high = int(widget.min), int(widget.max)
+        widget.set_value(tuple(sorted(rng.randint(low, high) for _ in range(2))))
+    else:
+        widget.set_value(rng.choice([o for o in widget.options if o != widget.value]))
+
+
+class Session:
+    """One simulated user: an AppTest plus its timings and errors."""
+
+    def __init__(self, seed):
+        self.rng = random.Random(seed)
+        self.at = AppTest.from_file(MAIN_SCRIPT, default_timeout=RUN_TIMEOUT)
+        self.latency = []
+        self.service = []
+        self.errors = []
+
+    def rerun(self, change=None):
+        requested = time.perf_counter()
+        try:
+            with _RUN_LOCK:
+                started = time.perf_counter()
+                if change is not None:
+                    _random_change(self.at, change, self.rng)
+                self.at.run()
+            finished = time.perf_counter()
+        except Exception as e:  # a timeout or a control missing from the page
+            self.errors.append(f"{change}: {type(e).__name__}: {e}")
+            return
+        if self.at.exception:
+            self.errors.append(f"{change}: {self.at.exception[0].message}")
+        self.latency.append(finished - requested)
+        self.service.append(finished - started)
+
+    def act(self, actions, think, start):
+        start.wait()
+        for _ in range(actions):
+            if think:
+                time.sleep(self.rng.uniform(0, 2 * think))
+            self.rerun(self.rng.choice(list(CONTROLS)))
+
+
+def _percentiles(seconds):
+    if not seconds:
+        return None
+    ms = np.asarray(seconds) * 1000
+    return {
+        "p50": round(float(np.percentile(ms, 50)), 1),
+        "p95": round(float(np.percentile(ms, 95)), 1),
+        "p99": round(float(np.percentile(ms, 99)), 1),
+        "max": round(float(ms.max()), 1),
+    }
+
+
+def run_level(n_sessions, actions, think, seed):
+    """Runs n_sessions concurrent sessions; returns their aggregated results."""
+    gc.collect()
+    rss_before = _rss_mb()
+    sessions = [Session(seed * 1000 + i) for i in range(n_sessions)]
+    for session in sessions:
+        session.rerun()  # first page load
+    first_load = [s.latency[0] for s in sessions if s.latency]
+    for session in sessions:
+        session.latency, session.service = [], []
+
+    start = threading.Barrier(n_sessions + 1)
+    threads = [
+        threading.Thread(target=s.act, args=(actions, think, start)) for s in sessions
+    ]
+    for thread in threads:
+        thread.start()
+    start.wait()
+    began = time.perf_counter()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - began
+
+    gc.collect()
+    rss_after = _rss_mb()
+    latency = [x for s in sessions for x in s.latency]
+    errors = [e for s in sessions for e in s.errors]
+    return {
+        "sessions": n_sessions,
+        "reruns": len(latency),
+        "errors": len(errors),
+        "error_samples": sorted(set(errors))[:5],
+        "seconds": round(elapsed, 2),
+        "throughput_per_s": round(len(latency) / elapsed, 2),
+        "first_load_ms": _percentiles(first_load),
+        "latency_ms": _percentiles(latency),
+        "service_ms": _percentiles([x for s in sessions for x in s.service]),
+        "rss_mb": {"before": round(rss_before, 1), "after": round(rss_after, 1)},
+        "rss_growth_per_session_mb": round((rss_after - rss_before) / n_sessions, 2),
+    }
+
+
+def environment():
+    return {
+        "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "machine": platform.node(),
+        "cpus": os.cpu_count(),
+        "python": platform.python_version(),
+        "streamlit": streamlit.__version__,
+    }
+
+
+def run(levels, actions, think, seed):
+    # AppTest re-applies Streamlit's log level on every run; keep per-rerun
+    # warnings (deprecations, missing script contexts) out of the table
+    logging.disable(logging.WARNING)
+    # Cold start (data load, cube, radar tables) outside the measured levels
+    started = time.perf_counter()
+    Session(seed).rerun()
+    cold_ms = (time.perf_counter() - started) * 1000
+    print(f"cold start: {cold_ms:.0f} ms")
+
+    print(
+        f"{'sessions':>8} {'reruns':>7} {'errors':>6} {'rerun/s':>8} {'p50 ms':>8} "
+        f"{'p95 ms':>8} {'p99 ms':>8} {'service p50':>11} {'MB/session':>10}"
+    )
+    results = []
+    for n in levels:
+        result = run_level(n, actions, think, seed)
+        results.append(result)
+        latency, service = result["latency_ms"] or {}, result["service_ms"] or {}
+        print(
+            f"{n:>8} {result['reruns']:>7} {result['errors']:>6} "
+            f"{result['throughput_per_s']:>8.2f} {latency.get('p50', 0):>8.0f} "
+            f"{latency.get('p95', 0):>8.0f} {latency.get('p99', 0):>8.0f} "
+            f"{service.get('p50', 0):>11.0f} {result['rss_growth_per_session_mb']:>10.2f}"
+        )
+        for sample in result["error_samples"]:
+            print(f"  error: {sample}")
+    return {
+        "environment": environment(),
+        "config": {"actions": actions, "think_s": think, "seed": seed},
+        "cold_start_ms": round(cold_ms, 1),
+        "results": results,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sessions", type=int, nargs="+", default=[1, 4, 16])
+    parser.add_argument("--actions", type=int, default=20, help="reruns per session")
+    parser.add_argument("--think", type=float, default=0.0, help="mean seconds between reruns")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", help="write the results to this file")
+    args = parser.parse_args()
+
+    report = run(args.sessions, args.actions, args.think, args.seed)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"results written to {args.json}")
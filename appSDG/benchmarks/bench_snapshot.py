@@ -0,0 +1,58 @@
+"""
+Compares cold `load_data` latency with and without the processed-data snapshot.
+
+Usage (from the appSDG folder):
+    python benchmarks/bench_snapshot.py [--repeat 5] [--scales 1 10 50]
+
+Each scale replicates the raw rows of SDG_final.csv that many times into a
+temporary file, so the pipeline cost grows while the snapshot read stays flat.
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import data_loader  # noqa: E402
+
+
+def _time(fn, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def run(scales, repeat):
+    source = os.path.join(os.path.dirname(data_loader.__file__), "SDG_final.csv")
+    raw = pd.read_csv(source)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        data_loader.SNAPSHOT_DIR = os.path.join(tmp, "snapshots")
+        print(f"{'scale':>6} {'rows':>9} {'pipeline (ms)':>14} {'snapshot (ms)':>14} {'speedup':>8}")
+        for scale in scales:
+            path = os.path.join(tmp, f"SDG_x{scale}.csv")
+            pd.concat([raw] * scale, ignore_index=True).to_csv(path, index=False)
+
+            cold = _time(lambda: data_loader.load_processed(path, use_snapshot=False), repeat)
+            data_loader.load_processed(path)  # write the snapshot
+            warm = _time(lambda: data_loader.load_processed(path), repeat)
+
+            print(
+                f"{scale:>6} {len(raw) * scale:>9} {cold * 1000:>14.1f} "
+                f"{warm * 1000:>14.1f} {cold / warm:>7.1f}x"
+            )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--scales", type=int, nargs="+", default=[1, 10, 50])
+    args = parser.parse_args()
+    run(args.scales, args.repeat)
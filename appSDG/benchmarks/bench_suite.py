@@ -0,0 +1,304 @@
+"""
+Benchmark suite for the load pipeline, the dashboard filters and the chart builders.
+
+Usage (from the appSDG folder):
+    python benchmarks/bench_suite.py [--scales 1 10 100] [--only load stage chart_map]
+        [--save] [--baseline benchmarks/baselines/baseline.json] [--tolerance 0.25]
+
+Every target is timed at each scale (best of --repeat, in ms):
+
+    load_cold          full pipeline on the export, no snapshot
+    load_snapshot      restart with the processed snapshot on disk
+    load_warm          rerun on an unchanged export (memoized DatasetStore)
+    stage_filter       filter_raw on the parsed export
+    stage_dedup        partial sums and means of the filtered rows
+    stage_pivot        long deduplicated rows -> (country, indicator, year) array
+    stage_interpolate  fill_gaps on that array
+    stage_melt         array -> long frame
+    filter_path        main.py's slice lookup, memo miss (charts and map slices)
+    radar_tables       radar scaling and averages for every year and region
+    chart_trend, chart_peer, chart_radar, chart_map
+                       figure build and compaction, as on a figure cache miss
+                       (no Streamlit, no browser)
+
+At scale N the load targets and the filter and dedup stages read SDG_final.csv
+with every raw row repeated N times (values jittered, so duplicates really are
+averaged). The pipeline keeps only the tracked countries, so the later stages,
+the filter path and the charts instead get N times the countries: the real
+series plus jittered copies under synthetic names, all selected.
+
+Results are compared with the baseline file when it exists; --save writes
+them to it instead. Exits with status 1 if any target is more than
+--tolerance slower than its baseline.
+"""
+import argparse
+import gc
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+
+import numpy as np
+import pandas as pd
+import plotly
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import data_loader  # noqa: E402
+from components import charts  # noqa: E402
+from components import map as map_component  # noqa: E402
+from components.compact import compact_figure  # noqa: E402
+from cube import SDGCube, SliceCache  # noqa: E402
+from ingest import RAW_DTYPES, filter_raw, finish_means, partial_sums  # noqa: E402
+from interpolation import fill_gaps  # noqa: E402
+from radar import RadarTables  # noqa: E402
+from utils_constants import CODE_TO_NAME, INDICATOR_RENAME_MAP, SDG_MAP  # noqa: E402
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(__file__), "baselines", "baseline.json")
+
+TARGETS = [
+    "load_cold",
+    "load_snapshot",
+    "load_warm",
+    "stage_filter",
+    "stage_dedup",
+    "stage_pivot",
+    "stage_interpolate",
+    "stage_melt",
+    "filter_path",
+    "radar_tables",
+    "chart_trend",
+    "chart_peer",
+    "chart_radar",
+    "chart_map",
+]
+
+# Indicator the filter path and the charts are timed on (under-5 mortality)
+INDICATOR_CODE = "3.2.1"
+
+# Synthetic countries get M49-like codes above the real ones (no map outline)
+SYNTHETIC_CODE_BASE = 1000
+
+
+def _time(fn, repeat):
+    fn()  # warm-up: first calls pay for imports and Plotly validators
+    best = float("inf")
+    # Collections triggered by earlier targets' garbage would land in random runs
+    gc.collect()
+    gc.disable()
+    try:
+        for _ in range(repeat):
+            start = time.perf_counter()
+            fn()
+            best = min(best, time.perf_counter() - start)
+    finally:
+        gc.enable()
+    return best
+
+
+# --- Synthetic datasets ---
+
+
+def inflate_rows(raw, scale, rng):
+    """Every raw row repeated `scale` times, numeric values jittered by +-5%."""
+    inflated = pd.concat([raw] * scale, ignore_index=True)
+    values = pd.to_numeric(inflated["Value"], errors="coerce")
+    jittered = (values * rng.uniform(0.95, 1.05, len(values))).round(3)
+    # Non-numeric entries ("<2.5") stay as they are, like in the export
+    inflated["Value"] = jittered.astype(str).where(values.notna(), inflated["Value"])
+    return inflated
+
+
+def inflate_countries(frame, deduped, scale, rng):
+    """
+    The processed frame and the deduplicated rows with `scale` times the
+    countries: copy k of each country is named "<name> #k" (code
+    SYNTHETIC_CODE_BASE * k + code), keeps its region and has jittered values.
+    """
+    names = list(frame["GeoAreaName"].cat.categories)
+    copies = [frame] + [
+        frame.assign(
+            GeoAreaName=frame["GeoAreaName"].astype(str) + f" #{k}",
+            GeoAreaCode=frame["GeoAreaCode"].astype("int32") + SYNTHETIC_CODE_BASE * k,
+            Value=frame["Value"] * rng.uniform(0.9, 1.1, len(frame)),
+        )
+        for k in range(1, scale)
+    ]
+    categories = names + [f"{n} #{k}" for k in range(1, scale) for n in names]
+    frame = pd.concat(copies, ignore_index=True)
+    frame["GeoAreaName"] = pd.Categorical(frame["GeoAreaName"], categories=categories)
+    frame["Region"] = frame["Region"].astype(str).astype("category")
+
+    deduped = pd.concat(
+        [deduped]
+        + [
+            deduped.assign(
+                GeoAreaCode=deduped["GeoAreaCode"].astype("int32") + SYNTHETIC_CODE_BASE * k,
+                Value=deduped["Value"] * rng.uniform(0.9, 1.1, len(deduped)),
+            )
+            for k in range(1, scale)
+        ],
+        ignore_index=True,
+    )
+    return frame, deduped
+
+
+# --- Targets ---
+
+
+def load_targets(raw_path, snapshot_dir):
+    data_loader.SNAPSHOT_DIR = snapshot_dir
+    store = data_loader.DatasetStore()
+    store.refresh(raw_path)
+    return {
+        "load_cold": lambda: data_loader.load_processed(raw_path, use_snapshot=False),
+        "load_snapshot": lambda: data_loader.load_processed(raw_path),
+        "load_warm": lambda: store.refresh(raw_path),
+    }
+
+
+def stage_targets(raw_path, deduped):
+    columns = data_loader.export_columns(raw_path)
+    raw = pd.read_csv(raw_path, usecols=columns, dtype={c: RAW_DTYPES[c] for c in columns})
+    filtered = filter_raw(raw.copy())
+    keys = ("GeoAreaCode", "IndicatorCode")
+    codes, indicators, values = data_loader.to_dense(deduped, keys=keys)
+    filled = fill_gaps(values)
+    return {
+        "stage_filter": lambda: filter_raw(raw.copy()),
+        "stage_dedup": lambda: finish_means(partial_sums(filtered)),
+        "stage_pivot": lambda: data_loader.to_dense(deduped, keys=keys),
+        "stage_interpolate": lambda: fill_gaps(values),
+        "stage_melt": lambda: data_loader.from_dense(codes, indicators, filled, keys=keys),
+    }
+
+
+def dashboard_targets(frame):
+    cube = SDGCube.from_frame(frame)
+    indicator = CODE_TO_NAME[INDICATOR_CODE]
+    indicator = INDICATOR_RENAME_MAP.get(indicator, indicator)
+    countries = list(cube.countries)
+    year_range = (2015, int(cube.years[-1]))
+
+    def filter_path():
+        return SliceCache(cube).get(indicator, year_range, countries, "All", countries)
+
+    slices = filter_path()
+    radar = RadarTables(cube, SDG_MAP)
+    mode = map_component.map_mode()
+    return {
+        "filter_path": filter_path,
+        "radar_tables": lambda: RadarTables(cube, SDG_MAP),
+        "chart_trend": lambda: compact_figure(
+            charts._trend_figure(slices.charts, indicator, "#4C9F38")
+        ),
+        "chart_peer": lambda: compact_figure(
+            charts._peer_figure(slices.charts, year_range[1], "#4C9F38", "#A5D6A7")
+        ),
+        "chart_radar": lambda: compact_figure(
+            charts._radar_figure(radar, year_range[1], "All", countries, "#4C9F38")
+        ),
+        "chart_map": lambda: compact_figure(
+            map_component._choropleth_figure(slices.map, year_range[1], mode)
+        ),
+    }
+
+
+def run(scales, only, repeat):
+    source = os.path.join(os.path.dirname(data_loader.__file__), "SDG_final.csv")
+    raw = pd.read_csv(source, dtype={"Value": "str"})
+    state = data_loader.build_state(source, use_snapshot=False)
+    rng = np.random.default_rng(0)
+    selected = [t for t in TARGETS if not only or any(t.startswith(o) for o in only)]
+
+    results = {target: {} for target in selected}
+    with tempfile.TemporaryDirectory() as tmp:
+        for scale in scales:
+            raw_path = os.path.join(tmp, f"SDG_x{scale}.csv")
+            inflate_rows(raw, scale, rng).to_csv(raw_path, index=False)
+            frame, deduped = inflate_countries(
+                state.frame, data_loader.read_sdg_export(source), scale, rng
+            )
+
+            targets = {}
+            if any(t.startswith("load_") for t in selected):
+                targets.update(load_targets(raw_path, os.path.join(tmp, f"snapshots_x{scale}")))
+            if any(t.startswith("stage_") for t in selected):
+                targets.update(stage_targets(raw_path, deduped))
+            if any(not t.startswith(("load_", "stage_")) for t in selected):
+                targets.update(dashboard_targets(frame))
+
+            for target in selected:
+                results[target][str(scale)] = round(_time(targets[target], repeat) * 1000, 3)
+    return results
+
+
+def environment():
+    return {
+        "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "machine": platform.node(),
+        "cpus": os.cpu_count(),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "pandas": pd.__version__,
+        "plotly": plotly.__version__,
+    }
+
+
+def report(results, baseline, tolerance):
+    """
+    Prints one row per target and scale; returns the (target, scale) pairs
+    slower than their baseline by more than `tolerance`.
+    """
+    regressions = []
+    print(f"{'target':<18} {'scale':>6} {'ms':>10} {'baseline':>10} {'change':>8}")
+    for target, timings in results.items():
+        for scale, ms in timings.items():
+            base = (baseline or {}).get(target, {}).get(scale)
+            change = ""
+            if base:
+                ratio = ms / base
+                change = f"{ratio - 1:+.0%}"
+                if ratio > 1 + tolerance:
+                    change += " !"
+                    regressions.append((target, scale))
+            base_text = f"{base:.3f}" if base else "-"
+            print(f"{target:<18} {scale:>6} {ms:>10.3f} {base_text:>10} {change:>8}")
+    return regressions
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--scales", type=int, nargs="+", default=[1, 10, 100])
+    parser.add_argument("--only", nargs="+", help="target name prefixes, e.g. load stage")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE)
+    parser.add_argument("--save", action="store_true", help="write results as the baseline")
+    parser.add_argument("--tolerance", type=float, default=0.25)
+    args = parser.parse_args()
+
+    results = run(args.scales, args.only, args.repeat)
+
+    baseline = None
+    if not args.save and os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            saved = json.load(f)
+        baseline = saved["results"]
+        print(f"baseline: {args.baseline} ({saved['environment']['created']})")
+    regressions = report(results, baseline, args.tolerance)
+
+    if args.save:
+        os.makedirs(os.path.dirname(os.path.abspath(args.baseline)), exist_ok=True)
+        with open(args.baseline, "w") as f:
+            json.dump(
+                {"environment": environment(), "repeat": args.repeat, "results": results},
+                f,
+                indent=2,
+            )
+        print(f"saved baseline to {args.baseline}")
+    elif regressions:
+        print(f"{len(regressions)} regression(s) over {args.tolerance:.0%}")
+        sys.exit(1)
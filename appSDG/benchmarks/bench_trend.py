@@ -0,0 +1,94 @@
+"""
+Compares the trend chart's per-country SVG path with the large-plot path
+(Scattergl, merged context trace) at several country counts.
+
+Usage (from the appSDG folder):
+    python benchmarks/bench_trend.py [--countries 13 100 250] [--years 2000 2024] [--decimate 12]
+
+Prints build time, JSON size and, when kaleido is installed, the time Plotly.js
+takes to render the figure in kaleido's headless Chromium (PNG export).
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+import plotly.io as pio
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from components import charts  # noqa: E402
+
+try:
+    import kaleido  # noqa: F401
+except ImportError:
+    kaleido = None
+
+
+def make_trends(n_countries, first_year, last_year, seed=0):
+    """Long (GeoAreaName, TimePeriod, Value) frame with India plus n-1 random walks."""
+    rng = np.random.default_rng(seed)
+    years = np.arange(first_year, last_year + 1)
+    names = ["India"] + [f"Country {i:03d}" for i in range(1, n_countries)]
+    values = 50 + rng.normal(0, 1.5, (n_countries, len(years))).cumsum(axis=1)
+    return pd.DataFrame(
+        {
+            "GeoAreaName": pd.Categorical(np.repeat(names, len(years)), categories=names),
+            "TimePeriod": np.tile(years, n_countries),
+            "Value": values.ravel(),
+        }
+    )
+
+
+def _best(fn, repeat):
+    best, result = float("inf"), None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def _build(df, large, decimate):
+    if large:
+        return charts._large_trend_figure(df, "Indicator", "#2E7D32", decimate)
+    threshold = charts.TREND_TRACE_THRESHOLD, charts.TREND_POINT_THRESHOLD
+    charts.TREND_TRACE_THRESHOLD = charts.TREND_POINT_THRESHOLD = float("inf")
+    try:
+        return charts._trend_figure(df, "Indicator", "#2E7D32")
+    finally:
+        charts.TREND_TRACE_THRESHOLD, charts.TREND_POINT_THRESHOLD = threshold
+
+
+def run(country_counts, first_year, last_year, decimate, repeat):
+    if kaleido is not None:
+        pio.to_image(_build(make_trends(3, first_year, last_year), False, None), format="png")
+    print(f"{'countries':>9} {'path':>10} {'traces':>7} {'build (ms)':>11} {'bytes':>10} {'render (ms)':>12}")
+    paths = [("svg", False, None), ("webgl", True, None)]
+    if decimate:
+        paths.append((f"webgl/{decimate}", True, decimate))
+    for n in country_counts:
+        df = make_trends(n, first_year, last_year)
+        for name, large, points in paths:
+            build, fig = _best(lambda: _build(df, large, points), repeat)
+            size = len(pio.to_json(fig, validate=False))
+            render = "-"
+            if kaleido is not None:
+                seconds, _ = _best(lambda: pio.to_image(fig, format="png"), repeat)
+                render = f"{seconds * 1000:.0f}"
+            print(
+                f"{n:>9} {name:>10} {len(fig.data):>7} {build * 1000:>11.1f} "
+                f"{size:>10,} {render:>12}"
+            )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--countries", type=int, nargs="+", default=[13, 100, 250])
+    parser.add_argument("--years", type=int, nargs=2, default=[2000, 2024])
+    parser.add_argument("--decimate", type=int, default=12)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    run(args.countries, args.years[0], args.years[1], args.decimate, args.repeat)
@@ -0,0 +1,180 @@
+"""
+Local stand-in for the UN SDG API (/v1/sdg/Series/Data), served from
+SDG_final.csv, for testing and measuring sdg_sync.py without network access.
+
+Usage (from the appSDG folder):
+    python benchmarks/sdg_api_standin.py [--page-size 25] [--latency-ms 20] [--concurrency 1 4 8]
+
+Runs a full sync and then a conditional re-sync (every series should come
+back 304) against the stand-in for each concurrency level, printing fetch
+throughput, and checks the mirror processes to the same frame as the source,
+also after one per-series file has been deleted and synced again.
+"""
+import argparse
+import hashlib
+import json
+import math
+import os
+import sys
+import tempfile
+import threading
+import time
+import urllib.parse
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import data_loader  # noqa: E402
+import sdg_sync  # noqa: E402
+
+
+def _clean(value):
+    if value is None or (isinstance(value, float) and math.isnan(value)):
+        return None
+    return value
+
+
+def source_records(csv_path):
+    """
+    API-shaped data records grouped by series code.
+    """
+    raw = pd.read_csv(csv_path, dtype=str)
+    records = {}
+    for row in raw.to_dict("records"):
+        row = {k: _clean(v) for k, v in row.items()}
+        records.setdefault(row["SeriesCode"], []).append(
+            {
+                "goal": [row["Goal"]],
+                "target": [row["Target"]],
+                "indicator": [row["Indicator"]],
+                "series": row["SeriesCode"],
+                "seriesDescription": row["SeriesDescription"],
+                "geoAreaCode": row["GeoAreaCode"],
+                "geoAreaName": row["GeoAreaName"],
+                "timePeriodStart": float(row["TimePeriod"]),
+                "value": row["Value"],
+                "time_detail": row["Time_Detail"],
+                "upperBound": row["UpperBound"],
+                "lowerBound": row["LowerBound"],
+                "source": row["Source"],
+                "footnotes": [row["FootNote"]] if row["FootNote"] else [],
+                "dimensions": {c: row[c] for c in sdg_sync.DIMENSION_COLUMNS if row[c]},
+                "attributes": {c: row[c] for c in sdg_sync.ATTRIBUTE_COLUMNS if row[c]},
+            }
+        )
+    return records
+
+
+def make_handler(records, names_by_code, latency):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        disable_nagle_algorithm = True
+
+        def log_message(self, *args):
+            pass
+
+        def do_GET(self):
+            url = urllib.parse.urlsplit(self.path)
+            if not url.path.endswith(sdg_sync.DATA_ENDPOINT):
+                self.send_error(404)
+                return
+            query = urllib.parse.parse_qs(url.query)
+            series = query.get("seriesCode", [""])[0]
+            areas = {names_by_code.get(c) for c in query.get("areaCode", [])}
+            page = int(query.get("page", ["1"])[0])
+            size = int(query.get("pageSize", ["1000"])[0])
+
+            data = [r for r in records.get(series, []) if r["geoAreaName"] in areas]
+            total_pages = max(1, math.ceil(len(data) / size))
+            etag = '"%s"' % hashlib.sha1(
+                json.dumps([series, sorted(filter(None, areas)), data]).encode()
+            ).hexdigest()
+
+            time.sleep(latency)
+            if self.headers.get("If-None-Match") == etag:
+                self.send_response(304)
+                self.send_header("ETag", etag)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+
+            body = json.dumps(
+                {
+                    "size": size,
+                    "totalElements": len(data),
+                    "totalPages": total_pages,
+                    "pageNumber": page,
+                    "data": data[(page - 1) * size : page * size],
+                }
+            ).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.send_header("ETag", etag)
+            self.end_headers()
+            self.wfile.write(body)
+
+    return Handler
+
+
+def serve(csv_path, latency=0.0):
+    """
+    Starts the stand-in on a free local port; returns (server, base_url).
+    """
+    names_by_code = {str(code): name for name, code in sdg_sync.GEO_AREA_CODES.items()}
+    server = ThreadingHTTPServer(
+        ("127.0.0.1", 0), make_handler(source_records(csv_path), names_by_code, latency)
+    )
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_port}/sdgapi"
+
+
+def run(page_size, latency_ms, concurrency_levels):
+    source = os.path.join(os.path.dirname(data_loader.__file__), "SDG_final.csv")
+    server, base_url = serve(source, latency_ms / 1000)
+    expected = data_loader.load_processed(source, use_snapshot=False)
+
+    try:
+        for concurrency in concurrency_levels:
+            with tempfile.TemporaryDirectory() as mirror:
+                full = sdg_sync.run_sync(
+                    base_url, mirror_dir=mirror, concurrency=concurrency, page_size=page_size
+                )
+                again = sdg_sync.run_sync(
+                    base_url, mirror_dir=mirror, concurrency=concurrency, page_size=page_size
+                )
+                mirrored = data_loader.load_processed(
+                    os.path.join(mirror, sdg_sync.MIRROR_FILE), use_snapshot=False
+                )
+                pd.testing.assert_frame_equal(mirrored, expected, check_exact=True)
+                assert again.series_updated == 0, "conditional re-sync refetched data"
+
+                # A lost per-series file is refetched, not skipped on a 304
+                series_dir = os.path.join(mirror, "series")
+                os.remove(os.path.join(series_dir, sorted(os.listdir(series_dir))[0]))
+                repaired = sdg_sync.run_sync(
+                    base_url, mirror_dir=mirror, concurrency=concurrency, page_size=page_size
+                )
+                mirrored = data_loader.load_processed(
+                    os.path.join(mirror, sdg_sync.MIRROR_FILE), use_snapshot=False
+                )
+                pd.testing.assert_frame_equal(mirrored, expected, check_exact=True)
+                assert repaired.series_updated == 1, "missing series file was not refetched"
+
+            print(f"concurrency {concurrency}")
+            print(f"  full sync:   {full.report()}")
+            print(f"  conditional: {again.report()}")
+    finally:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--page-size", type=int, default=25)
+    parser.add_argument("--latency-ms", type=float, default=20)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 4, 8])
+    args = parser.parse_args()
+    run(args.page_size, args.latency_ms, args.concurrency)
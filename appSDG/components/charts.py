@@ -1,11 +1,27 @@
+import numpy as np
 import plotly.express as px
 import plotly.graph_objects as go
 import streamlit as st
-import pandas as pd
 from utils import get_sdg_colors
+from components.figure_cache import get_figure_cache
+from components.playback import animate
+from timing import timed
 
+# Above either threshold the trend chart switches to the large-plot path:
+# WebGL, India as its own trace and every other country merged into one
+# context trace. Set at the crossovers measured by bench_trend.py (software
+# WebGL, whose ~1.2 s context setup is fixed): SVG rendering jumps from ~0.2 s
+# to ~1.2 s just past 1,000 points, and below that grows to ~1.2 s (with the
+# build) at about 100 countries
+TREND_TRACE_THRESHOLD = 100
+TREND_POINT_THRESHOLD = 1000
 
-def plot_trend_line(df, indicator, selected_sdg):
+# Points kept per context country on the large-plot path (None keeps all)
+TREND_DECIMATE_POINTS = None
+
+
+@timed("plot.trend_line")
+def plot_trend_line(df, indicator, selected_sdg, playback=False):
     st.subheader("1. Regional Trajectory")
 
     # Validation
@@ -15,7 +31,25 @@ def plot_trend_line(df, indicator, selected_sdg):
 
     # Get Theme Colors
     theme = get_sdg_colors(selected_sdg)
-    main_color = theme["main"]
+
+    # Rebuilt only when the slice, indicator or theme colour changes
+    if playback:
+        fig_trend = get_figure_cache().get(
+            "trend_playback", _trend_playback_figure, df, indicator, theme["main"]
+        )
+    else:
+        fig_trend = get_figure_cache().get(
+            "trend", _trend_figure, df, indicator, theme["main"]
+        )
+    st.plotly_chart(fig_trend, use_container_width=True)
+
+
+def _trend_figure(df, indicator, main_color):
+    if (
+        df["GeoAreaName"].nunique() > TREND_TRACE_THRESHOLD
+        or len(df) > TREND_POINT_THRESHOLD
+    ):
+        return _large_trend_figure(df, indicator, main_color, TREND_DECIMATE_POINTS)
 
     # Plot
     fig_trend = px.line(
@@ -34,10 +68,103 @@ def plot_trend_line(df, indicator, selected_sdg):
     fig_trend.update_traces(
         selector=dict(name="India"), line=dict(width=4, color=main_color), opacity=1.0
     )
-
-    st.plotly_chart(fig_trend, use_container_width=True)
-
-
+    return fig_trend
+
+
+def _large_trend_figure(df, indicator, main_color, max_points=None):
+    """
+    Scattergl trend for many countries: India highlighted on its own, the
+    rest as one context trace whose series are separated by None gaps.
+    """
+    data = df.sort_values(["GeoAreaName", "TimePeriod"])
+    names = data["GeoAreaName"].astype(str).to_numpy()
+    x = data["TimePeriod"].to_numpy()
+    y = data["Value"].to_numpy(dtype="float64")
+    focus = names == "India"
+
+    xs, ys, labels = [], [], []
+    context = np.flatnonzero(~focus)
+    breaks = np.flatnonzero(names[context][1:] != names[context][:-1]) + 1
+    for rows in np.split(context, breaks) if len(context) else []:
+        keep = _decimate(y[rows], max_points)
+        xs.extend(x[rows][keep].tolist() + [None])
+        ys.extend(y[rows][keep].tolist() + [None])
+        labels.extend([names[rows[0]]] * len(keep) + [None])
+
+    fig_trend = go.Figure()
+    fig_trend.add_trace(
+        go.Scattergl(
+            x=xs,
+            y=ys,
+            mode="lines",
+            name="Other countries",
+            hovertext=labels,
+            hovertemplate="%{hovertext}<br>%{x}: %{y:.2f}<extra></extra>",
+            line=dict(width=1.2, color="rgba(120,120,120,0.45)"),
+        )
+    )
+    fig_trend.add_trace(
+        go.Scattergl(
+            x=x[focus],
+            y=y[focus],
+            mode="lines",
+            name="India",
+            hovertemplate="India<br>%{x}: %{y:.2f}<extra></extra>",
+            line=dict(width=4, color=main_color),
+        )
+    )
+    fig_trend.update_layout(
+        title=f"{indicator}: Trend over Time",
+        xaxis_title="TimePeriod",
+        yaxis_title="Value",
+        legend_title_text="GeoAreaName",
+    )
+    return fig_trend
+
+
+def _decimate(values, max_points):
+    """
+    Positions to keep from one series: all of them, or with max_points the
+    first, the last and the min and max of evenly sized buckets in between
+    (so peaks survive, unlike plain striding).
+    """
+    n = len(values)
+    if max_points is None or n <= max_points:
+        return np.arange(n)
+    edges = np.linspace(1, n - 1, max(1, (max_points - 2) // 2) + 1).astype(int)
+    keep = {0, n - 1}
+    for start, stop in zip(edges[:-1], edges[1:]):
+        if stop > start:
+            bucket = values[start:stop]
+            keep.update((start + int(np.nanargmin(bucket)), start + int(np.nanargmax(bucket))))
+    return np.array(sorted(keep))
+
+
+def _trend_playback_figure(df, indicator, main_color):
+    """
+    The full trend figure plus one frame per year that draws each line up to
+    that year, with the axes fixed to the full extent.
+    """
+    fig_trend = _trend_figure(df, indicator, main_color)
+
+    years = sorted(df["TimePeriod"].unique())
+    low, high = df["Value"].min(), df["Value"].max()
+    pad = (high - low) * 0.05 or 1.0
+    fig_trend.update_xaxes(range=[years[0] - 0.5, years[-1] + 0.5])
+    fig_trend.update_yaxes(range=[low - pad, high + pad])
+
+    frames = {}
+    for year in years:
+        data = []
+        for trace in fig_trend.data:
+            # None entries separate the series of the merged context trace
+            upto = [i for i, x in enumerate(trace.x) if x is None or x <= year]
+            data.append({"x": [trace.x[i] for i in upto], "y": [trace.y[i] for i in upto]})
+        frames[year] = (data, None)
+    return animate(fig_trend, frames)
+
+
+@timed("plot.peer_comparison")
 def plot_peer_comparison(df, latest_year, selected_sdg):  # Added selected_sdg arg
     st.subheader("2. Peer Comparison (Latest Year)")
 
@@ -47,9 +174,14 @@ def plot_peer_comparison(df, latest_year, selected_sdg):  # Added selected_sdg a
 
     # Get Theme Colors
     theme = get_sdg_colors(selected_sdg)
-    main_color = theme["main"]
-    light_color = theme["light"]
 
+    fig_bar = get_figure_cache().get(
+        "peer", _peer_figure, df, latest_year, theme["main"], theme["light"]
+    )
+    st.plotly_chart(fig_bar, use_container_width=True)
+
+
+def _peer_figure(df, latest_year, main_color, light_color):
     bar_data = df[df["TimePeriod"] == latest_year].sort_values("Value", ascending=True)
 
     # Color logic: Highlight India with Theme Color, Peers with light distinct color
@@ -65,127 +197,79 @@ def plot_peer_comparison(df, latest_year, selected_sdg):  # Added selected_sdg a
         ]
     )
     fig_bar.update_layout(title=f"Standing in {latest_year}")
-    st.plotly_chart(fig_bar, use_container_width=True)
+    return fig_bar
 
 
+@timed("plot.radar_chart")
 def plot_radar_chart(
-    df, latest_year, sdg_map, selected_region, selected_countries, selected_sdg
+    radar, latest_year, selected_region, selected_countries, selected_sdg
 ):
     st.subheader("3. Comprehensive SDG Performance (Goals 2, 3, 6)")
 
     # Get Theme Colors
     theme = get_sdg_colors(selected_sdg)
-    main_color = theme["main"]
-
-    # 1. Gather ALL relevant indicators (ordered by SDG)
-    # We flatten the map to get a single list of indicators in order
-    all_indicators = []
 
-    # Explicit order for coloring sectors
-    sdg_order = ["SDG 2", "SDG 3", "SDG 6"]
-    for sdg in sdg_order:
-        if sdg in sdg_map:
-            all_indicators.extend(sdg_map[sdg])
-
-    # Filter for relevant data (All countries, latest year)
-    radar_base_df = df[
-        (df["Indicator"].isin(all_indicators)) & (df["TimePeriod"] == latest_year)
-    ]
-
-    if radar_base_df.empty:
-        st.warning("Insufficient data for Radar Chart.")
-        return
-
-    # Pivot all data
-    pivot_all = radar_base_df.pivot_table(
-        index="GeoAreaName", columns="Indicator", values="Value", aggfunc="mean"
+    fig_radar = get_figure_cache().get(
+        "radar",
+        _radar_figure,
+        radar,
+        latest_year,
+        selected_region,
+        list(selected_countries),
+        theme["main"],
     )
-
-    if pivot_all.empty:
-        st.warning("No pivot data for Radar.")
+    if fig_radar is None:
+        st.warning("Insufficient data for Radar Chart.")
         return
+    st.plotly_chart(fig_radar, use_container_width=True)
 
-    # --- IMPROVED NORMALIZATION: Context-Aware ---
-    relevant_countries = set(selected_countries)
-    relevant_countries.add("India")
-    if selected_region in ["All", "South Asia"]:
-        relevant_countries.update(
-            df[df["Region"] == "South Asia"]["GeoAreaName"].unique()
-        )
-    if selected_region in ["All", "South East Asia"]:
-        relevant_countries.update(
-            df[df["Region"] == "South East Asia"]["GeoAreaName"].unique()
-        )
-
-    scaling_df = radar_base_df[radar_base_df["GeoAreaName"].isin(relevant_countries)]
-    if scaling_df.empty:
-        scaling_df = radar_base_df
 
-    pivot_scaling = scaling_df.pivot_table(
-        index="GeoAreaName", columns="Indicator", values="Value", aggfunc="mean"
+def _radar_figure(radar, latest_year, selected_region, selected_countries, main_color):
+    # Scaling and averages are precomputed per (year, region context) at load time
+    view = (
+        radar.view(latest_year, selected_region, selected_countries)
+        if radar is not None
+        else None
     )
+    if view is None:
+        return None
 
-    local_min = pivot_scaling.min()
-    local_max = pivot_scaling.max()
-    diff = local_max - local_min
-    diff[diff == 0] = 1
-
-    def get_norm_values(series):
-        # Handle missing columns safely
-        valid_cols = [c for c in all_indicators if c in pivot_all.columns]
-        # Align series to these cols
-        s = series.reindex(valid_cols)
-        m = local_min.reindex(valid_cols)
-        d = diff.reindex(valid_cols)
-        return ((s - m) / d).fillna(0).tolist()  # FillNA 0 for safety
-
-    # Ensure categories match the order of 'all_indicators' present in data
-    categories = [c for c in all_indicators if c in pivot_all.columns]
+    categories = view.categories
 
     fig_radar = go.Figure()
 
     # --- 1. Regional Averages ---
-    if selected_region in ["All", "South Asia"]:
-        sa_countries = radar_base_df[radar_base_df["Region"] == "South Asia"]
-        if not sa_countries.empty:
-            sa_avg = sa_countries.pivot_table(
-                columns="Indicator", values="Value", aggfunc="mean"
-            ).iloc[0]
-            fig_radar.add_trace(
-                go.Scatterpolar(
-                    r=get_norm_values(sa_avg),
-                    theta=categories,
-                    fill="toself",
-                    name="South Asia Avg",
-                    line_color="orange",
-                    opacity=0.3,
-                    line_dash="dash",
-                )
+    if "South Asia" in view.averages:
+        fig_radar.add_trace(
+            go.Scatterpolar(
+                r=view.averages["South Asia"],
+                theta=categories,
+                fill="toself",
+                name="South Asia Avg",
+                line_color="orange",
+                opacity=0.3,
+                line_dash="dash",
             )
+        )
 
-    if selected_region in ["All", "South East Asia"]:
-        sea_countries = radar_base_df[radar_base_df["Region"] == "South East Asia"]
-        if not sea_countries.empty:
-            sea_avg = sea_countries.pivot_table(
-                columns="Indicator", values="Value", aggfunc="mean"
-            ).iloc[0]
-            fig_radar.add_trace(
-                go.Scatterpolar(
-                    r=get_norm_values(sea_avg),
-                    theta=categories,
-                    fill="toself",
-                    name="SE Asia Avg",
-                    line_color="teal",
-                    opacity=0.3,
-                    line_dash="dash",
-                )
+    if "South East Asia" in view.averages:
+        fig_radar.add_trace(
+            go.Scatterpolar(
+                r=view.averages["South East Asia"],
+                theta=categories,
+                fill="toself",
+                name="SE Asia Avg",
+                line_color="teal",
+                opacity=0.3,
+                line_dash="dash",
             )
+        )
 
     # --- 2. Focus Country (India) ---
-    if "India" in pivot_all.index:
+    if "India" in view.countries:
         fig_radar.add_trace(
             go.Scatterpolar(
-                r=get_norm_values(pivot_all.loc["India"]),
+                r=view.countries["India"],
                 theta=categories,
                 fill="toself",
                 name="India",
@@ -197,10 +281,10 @@ def plot_radar_chart(
 
     # --- 3. Peers ---
     for country in selected_countries:
-        if country != "India" and country in pivot_all.index:
+        if country != "India" and country in view.countries:
             fig_radar.add_trace(
                 go.Scatterpolar(
-                    r=get_norm_values(pivot_all.loc[country]),
+                    r=view.countries[country],
                     theta=categories,
                     fill="none",
                     name=country,
@@ -221,4 +305,4 @@ def plot_radar_chart(
         height=600,
         margin=dict(t=50, b=50, l=100, r=100),  # Extra margin for long labels
     )
-    st.plotly_chart(fig_radar, use_container_width=True)
+    return fig_radar
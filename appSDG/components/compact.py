@@ -0,0 +1,69 @@
+import numpy as np
+import plotly.graph_objects as go
+
+# Decimal places kept in plotted values; hover shows at most two
+DISPLAY_DECIMALS = 2
+
+# Hand data arrays to Plotly as NumPy arrays, which Plotly >= 6 serializes as
+# base64 typed arrays (Plotly 5 writes them as plain lists either way). Off:
+# floats rounded to DISPLAY_DECIMALS are shorter as JSON text than as base64
+# float64, so with plotly 6 it makes the radar larger and the rest no smaller
+BINARY_ARRAYS = False
+
+# Trace attributes holding per-point data
+DATA_KEYS = ("x", "y", "z", "r", "lat", "lon")
+
+
+def compact_figure(fig, decimals=DISPLAY_DECIMALS, binary=BINARY_ARRAYS):
+    """
+    Shrinks the JSON spec of a built figure in place and returns it: float
+    data rounded to `decimals`, customdata that no template references
+    dropped, and the template reduced to its layout plus the trace defaults
+    of trace types the figure (or its frames) actually uses.
+    """
+    traces = list(fig.data) + [t for frame in fig.frames or () for t in frame.data]
+    for trace in traces:
+        for key in DATA_KEYS:
+            if key in trace and trace[key] is not None:
+                trace[key] = _compact_array(trace[key], decimals, binary)
+        if "customdata" in trace and trace.customdata is not None and not _uses_customdata(trace):
+            trace.customdata = None
+
+    template = fig.layout.template
+    if template is not None and template.data is not None:
+        used = {trace.type for trace in traces}
+        fig.layout.template = go.layout.Template(
+            layout=template.layout,
+            data={
+                name: defaults
+                for name, defaults in template.data.to_plotly_json().items()
+                if name in used
+            },
+        )
+    return fig
+
+
+def _compact_array(values, decimals, binary):
+    if isinstance(values, str):
+        return values
+    array = np.asarray(values)
+    if array.dtype == object:
+        # e.g. None separators between series: round the numbers, keep the rest
+        return [round(v, decimals) if isinstance(v, float) else v for v in array.tolist()]
+    if array.dtype.kind == "f":
+        array = array.round(decimals)
+    elif array.dtype.kind in "iu" and array.size:
+        # Smallest integer type that holds the values (years fit in int16)
+        array = array.astype(
+            np.result_type(
+                np.min_scalar_type(int(array.min())), np.min_scalar_type(int(array.max()))
+            )
+        )
+    else:
+        return values
+    return array if binary else array.tolist()
+
+
+def _uses_customdata(trace):
+    templates = [trace[key] for key in ("hovertemplate", "texttemplate") if key in trace]
+    return any(t and "customdata" in str(t) for t in templates)
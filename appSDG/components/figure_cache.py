@@ -0,0 +1,95 @@
+import hashlib
+import threading
+from collections import OrderedDict
+
+import pandas as pd
+import plotly.io as pio
+import streamlit as st
+from components.compact import compact_figure
+from timing import span
+
+# Upper bound on the serialized size of the cached figures
+FIGURE_CACHE_BYTES = 64 << 20
+
+
+class FigureCache:
+    """
+    LRU cache of built Plotly figures, keyed by a digest of the chart's inputs
+    (frames by content, plus theme and options), and bounded by the size of
+    their JSON specs. A hit skips the Plotly Express build and validation;
+    Streamlit only serializes the cached figure. Figures are compacted
+    (compact_figure) once, when built.
+
+    Shared by all sessions, so cached figures must not be modified.
+    """
+
+    def __init__(self, max_bytes=FIGURE_CACHE_BYTES):
+        self.max_bytes = max_bytes
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, kind, build, *inputs):
+        """
+        Returns build(*inputs), reusing the figure from an earlier call with
+        the same kind and equal inputs. build may return None (nothing to plot).
+        """
+        key = content_key(kind, *inputs)
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key][0]
+            self.misses += 1
+
+        with span(f"figure.{kind}.build"):
+            fig = build(*inputs)
+            if fig is not None:
+                compact_figure(fig)
+        size = len(pio.to_json(fig, validate=False)) if fig is not None else 0
+        with self._lock:
+            if key not in self._entries:
+                self._entries[key] = (fig, size)
+                self.bytes += size
+            while self.bytes > self.max_bytes and len(self._entries) > 1:
+                _, (_, evicted) = self._entries.popitem(last=False)
+                self.bytes -= evicted
+                self.evictions += 1
+        return fig
+
+    def stats(self):
+        return {
+            "entries": len(self._entries),
+            "bytes": self.bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+
+def content_key(*parts):
+    """
+    Digest of chart inputs: DataFrames by columns, dtypes and row hashes,
+    objects with a `digest` (the cube) by that, everything else by repr.
+    """
+    h = hashlib.blake2b(digest_size=16)
+    for part in parts:
+        if isinstance(part, pd.DataFrame):
+            h.update(repr((list(part.columns), [str(t) for t in part.dtypes])).encode())
+            h.update(pd.util.hash_pandas_object(part, index=False).to_numpy().tobytes())
+        elif hasattr(part, "digest"):
+            h.update(part.digest.encode())
+        elif isinstance(part, dict):
+            h.update(repr(sorted(part.items())).encode())
+        else:
+            h.update(repr(part).encode())
+        h.update(b"\x00")
+    return h.hexdigest()
+
+
+@st.cache_resource
+def get_figure_cache():
+    return FigureCache()
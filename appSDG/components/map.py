@@ -1,66 +1,60 @@
+import os
+
 import plotly.express as px
 import streamlit as st
+from components.figure_cache import get_figure_cache
+from components.playback import animate
+from geo import load_geojson
+from timing import timed
+from utils_constants import GEO_AREA_CODES
+
+# Initial map zoom; also picks the bundled outline variant (see geo.py)
+MAP_ZOOM = 3
+
+# "tiles": outlines over Carto basemap tiles; "offline": a projected map of the
+# bundled outlines only, with nothing fetched from a tile server
+MAP_MODES = ("tiles", "offline")
+
+# A geo subplot makes plotly.js fetch world_110m.json from cdn.plot.ly even with
+# the base layers hidden; offline maps read this empty topology from static/
+OFFLINE_TOPOJSON_URL = "app/static/topojson/"
 
-WORLD_GEOJSON_URL = (
-    "https://raw.githubusercontent.com/johan/world.geo.json/master/countries.geo.json"
-)
 
-# The Johan world GeoJSON uses slightly different country names than the UN SDG database.
-# This mapping normalises the dataset names before plotting.
-GEO_NAME_FIX = {
-    "Viet Nam": "Vietnam",
-}
+def map_mode():
+    """
+    Map rendering mode from SDG_MAP_MODE (default "tiles").
+    """
+    mode = os.environ.get("SDG_MAP_MODE", "tiles").strip().lower()
+    return mode if mode in MAP_MODES else "tiles"
 
 
-def plot_choropleth(df, year):
-    st.subheader(f"Geospatial View: ({year})")
+@timed("plot.choropleth")
+def plot_choropleth(df, year, playback=False):
+    """
+    Choropleth of `year`, or with playback=True one figure animated over
+    every year in df (scrubbed in the browser; the slider starts on `year`).
+    """
+    if playback and not df.empty:
+        st.subheader(
+            f"Geospatial View: ({df['TimePeriod'].min()}–{df['TimePeriod'].max()})"
+        )
+    else:
+        st.subheader(f"Geospatial View: ({year})")
 
     if df.empty:
         st.warning("No data available for map.")
         return
 
-    map_data = df[df["TimePeriod"] == year].copy()
-
-    if map_data.empty:
+    if playback:
+        fig = get_figure_cache().get("map_playback", _playback_figure, df, map_mode())
+    else:
+        fig = get_figure_cache().get("map", _choropleth_figure, df, year, map_mode())
+    if fig is None:
         st.warning(f"No data available for map in year {year}.")
         return
 
-    # Normalise country names to match the GeoJSON
-    map_data["GeoAreaName"] = map_data["GeoAreaName"].replace(GEO_NAME_FIX)
-
-    fig = px.choropleth_mapbox(
-        map_data,
-        geojson=WORLD_GEOJSON_URL,
-        locations="GeoAreaName",
-        featureidkey="properties.name",
-        color="Value",
-        color_continuous_scale="Plasma",
-        range_color=(map_data["Value"].min(), map_data["Value"].max()),
-        mapbox_style="carto-positron",
-        zoom=3,
-        center={"lat": 15, "lon": 100},
-        opacity=0.82,
-        labels={"Value": "Value"},
-        hover_name="GeoAreaName",
-        hover_data={"Value": ":.2f", "GeoAreaName": False},
-    )
-
-    fig.update_layout(
-        margin={"r": 0, "t": 0, "l": 0, "b": 0},
-        height=560,
-        paper_bgcolor="rgba(0,0,0,0)",
-        plot_bgcolor="rgba(0,0,0,0)",
-        coloraxis_colorbar=dict(
-            title="Value",
-            thickness=14,
-            len=0.6,
-            bgcolor="rgba(255,255,255,0.7)",
-            bordercolor="rgba(0,0,0,0.1)",
-            borderwidth=1,
-        ),
-    )
-
-    st.plotly_chart(fig, use_container_width=True)
+    config = {"topojsonURL": OFFLINE_TOPOJSON_URL} if map_mode() == "offline" else None
+    st.plotly_chart(fig, use_container_width=True, config=config)
 
     st.markdown(
         """
@@ -76,8 +70,8 @@ def plot_choropleth(df, year):
             line-height: 1.5;
         ">
         ⚠️ <strong>Map Note (India):</strong>
-        India is rendered here using standard boundaries as provided by the
-        <em>Johan world GeoJSON</em> (sourced from Natural Earth / OpenStreetMap).
+        India is rendered here using outlines simplified from the
+        <em>Natural Earth 1:110m</em> admin-0 country boundaries.
         This open-source dataset does <strong>not</strong> depict the complete,
         legally accurate boundary of India, including Jammu &amp; Kashmir,
         Aksai Chin, and other territories.
@@ -90,3 +84,97 @@ def plot_choropleth(df, year):
         """,
         unsafe_allow_html=True,
     )
+
+
+def _choropleth_figure(df, year, mode="tiles"):
+    map_data = _map_data(df[df["TimePeriod"] == year])
+
+    if map_data.empty:
+        return None
+
+    return _map_figure(
+        map_data, mode, (map_data["Value"].min(), map_data["Value"].max())
+    )
+
+
+def _playback_figure(df, mode="tiles"):
+    """
+    Map of the last year in df with a frame per year. Each frame keeps the
+    colour range of its own year, like the single-year map; all ranges come
+    from one groupby instead of being computed per frame.
+    """
+    map_data = _map_data(df)
+    if map_data.empty:
+        return None
+
+    ranges = map_data.groupby("TimePeriod")["Value"].agg(["min", "max"])
+    by_year = dict(tuple(map_data.groupby("TimePeriod")))
+    last = ranges.index[-1]
+    fig = _map_figure(by_year[last], mode, tuple(ranges.loc[last]))
+
+    frames = {}
+    for year, (low, high) in ranges.iterrows():
+        rows = by_year[year]
+        frames[year] = (
+            [
+                {
+                    "locations": rows["GeoAreaCode"].tolist(),
+                    "z": rows["Value"].tolist(),
+                    "hovertext": rows["GeoAreaName"].tolist(),
+                }
+            ],
+            {"coloraxis": {"cmin": low, "cmax": high}},
+        )
+    return animate(fig, frames, redraw=True)
+
+
+def _map_data(df):
+    map_data = df.copy()
+    # Bundled outlines are keyed by M49 code, so no name matching is needed
+    map_data["GeoAreaName"] = map_data["GeoAreaName"].astype(str)
+    map_data["GeoAreaCode"] = map_data["GeoAreaName"].map(GEO_AREA_CODES)
+    return map_data
+
+
+def _map_figure(map_data, mode, range_color):
+    # Shared by both modes, so colours and hover read the same either way
+    style = dict(
+        geojson=load_geojson(MAP_ZOOM),
+        locations="GeoAreaCode",
+        color="Value",
+        color_continuous_scale="Plasma",
+        range_color=range_color,
+        labels={"Value": "Value"},
+        hover_name="GeoAreaName",
+        hover_data={"Value": ":.2f", "GeoAreaName": False, "GeoAreaCode": False},
+    )
+
+    if mode == "offline":
+        fig = px.choropleth(map_data, projection="mercator", fitbounds="locations", **style)
+        fig.update_geos(visible=False, bgcolor="rgba(0,0,0,0)")
+        fig.update_traces(marker_line_color="rgba(255,255,255,0.9)", marker_line_width=0.8)
+    else:
+        fig = px.choropleth_mapbox(
+            map_data,
+            mapbox_style="carto-positron",
+            zoom=MAP_ZOOM,
+            center={"lat": 15, "lon": 100},
+            opacity=0.82,
+            **style,
+        )
+
+    fig.update_layout(
+        margin={"r": 0, "t": 0, "l": 0, "b": 0},
+        height=560,
+        paper_bgcolor="rgba(0,0,0,0)",
+        plot_bgcolor="rgba(0,0,0,0)",
+        coloraxis_colorbar=dict(
+            title="Value",
+            thickness=14,
+            len=0.6,
+            bgcolor="rgba(255,255,255,0.7)",
+            bordercolor="rgba(0,0,0,0.1)",
+            borderwidth=1,
+        ),
+    )
+    return fig
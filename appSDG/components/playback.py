@@ -0,0 +1,70 @@
+import plotly.graph_objects as go
+
+
+def animate(fig, frames, redraw=False):
+    """
+    Attaches year frames to fig with a play button and a year slider, both
+    handled by Plotly in the browser (scrubbing needs no server rerun).
+
+    `frames` maps each year label to (data, layout): per-trace updates in
+    trace order and a layout update, either of which may be None. The slider
+    starts on the last year, which should be what fig already shows.
+    Mapbox and geo traces need redraw=True to repaint on each frame.
+    """
+    labels = list(frames)
+    types = [trace.type for trace in fig.data]
+    fig.frames = [
+        go.Frame(
+            name=str(label),
+            data=[dict(update, type=t) for update, t in zip(data, types)] if data else None,
+            layout=layout,
+        )
+        for label, (data, layout) in frames.items()
+    ]
+
+    def step(names, duration):
+        return [
+            names,
+            {
+                "frame": {"duration": duration, "redraw": redraw},
+                "mode": "immediate",
+                "transition": {"duration": 0},
+            },
+        ]
+
+    fig.update_layout(
+        # Room below the plot for the controls
+        margin={"b": max(fig.layout.margin.b or 0, 90)},
+        updatemenus=[
+            {
+                "type": "buttons",
+                "direction": "left",
+                "showactive": False,
+                "x": 0.0,
+                "y": 0.0,
+                "xanchor": "left",
+                "yanchor": "top",
+                "pad": {"t": 42, "r": 10},
+                "buttons": [
+                    {"label": "▶", "method": "animate", "args": step(None, 600)},
+                    {"label": "❚❚", "method": "animate", "args": step([None], 0)},
+                ],
+            }
+        ],
+        sliders=[
+            {
+                "active": len(labels) - 1,
+                "x": 0.08,
+                "len": 0.92,
+                "y": 0.0,
+                "yanchor": "top",
+                "pad": {"t": 30},
+                "currentvalue": {"prefix": "Year: "},
+                "steps": [
+                    {"label": str(label), "method": "animate", "args": step([str(label)], 0)}
+                    for label in labels
+                ],
+            }
+        ],
+    )
+    return fig
@@ -0,0 +1,352 @@
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict, namedtuple
+
+import numpy as np
+import pandas as pd
+
+from timing import span
+
+
+class SDGCube:
+    """
+    Dense (indicator, country, year) array of the processed dataset with axis
+    lookups, so dashboard queries index into it instead of scanning the long frame.
+
+    Indicator and year selections are basic slices and return views; a country
+    selection returns a view when the chosen countries are contiguous on the
+    axis and a gather of just the selected rows otherwise.
+    """
+
+    def __init__(self, values, indicators, countries, years, regions):
+        self.values = values
+        self.values.setflags(write=False)
+        self.indicators = list(indicators)
+        self.countries = list(countries)
+        self.years = np.asarray(years, dtype="int64")
+        self.regions = np.asarray(regions, dtype=object)
+
+        self._indicator_pos = {name: i for i, name in enumerate(self.indicators)}
+        self._country_pos = {name: i for i, name in enumerate(self.countries)}
+        self._digest = None
+
+    @classmethod
+    def from_frame(cls, df):
+        """
+        Builds the cube from the categorical long frame returned by load_data.
+        """
+        indicators = df["Indicator"].cat.remove_unused_categories()
+        countries = df["GeoAreaName"].cat.remove_unused_categories()
+        years = np.arange(df["TimePeriod"].min(), df["TimePeriod"].max() + 1)
+
+        ind_pos = indicators.cat.codes.to_numpy()
+        country_pos = countries.cat.codes.to_numpy()
+        year_pos = df["TimePeriod"].to_numpy() - years[0]
+
+        values = np.full(
+            (len(indicators.cat.categories), len(countries.cat.categories), len(years)),
+            np.nan,
+        )
+        values[ind_pos, country_pos, year_pos] = df["Value"].to_numpy(dtype="float64")
+
+        regions = np.empty(len(countries.cat.categories), dtype=object)
+        regions[country_pos] = df["Region"].to_numpy(dtype=object)
+
+        return cls(
+            values,
+            indicators.cat.categories,
+            countries.cat.categories,
+            years,
+            regions,
+        )
+
+    def save(self, path):
+        """
+        Writes the values to `path` (.npy) and the axes to a .json sidecar,
+        each through a temp file and an atomic rename.
+        """
+        tmp_suffix = f".{os.getpid()}.tmp"
+        axes = {
+            "indicators": self.indicators,
+            "countries": self.countries,
+            "years": self.years.tolist(),
+            "regions": self.regions.tolist(),
+        }
+        # Sidecar first: a visible .npy always has its axes next to it
+        with open(_sidecar(path) + tmp_suffix, "w") as f:
+            json.dump(axes, f)
+        os.replace(_sidecar(path) + tmp_suffix, _sidecar(path))
+        with open(path + tmp_suffix, "wb") as f:
+            np.save(f, np.ascontiguousarray(self.values))
+        os.replace(path + tmp_suffix, path)
+
+    @classmethod
+    def open(cls, path):
+        """
+        Maps a cube written by save() read-only, so every process that opens
+        the same file shares one copy of the values in the page cache.
+        Returns None if the file is missing or unreadable.
+        """
+        try:
+            with open(_sidecar(path)) as f:
+                axes = json.load(f)
+            values = np.load(path, mmap_mode="r")
+        except (OSError, ValueError):
+            return None
+        return cls(
+            values.view(np.ndarray),
+            axes["indicators"],
+            axes["countries"],
+            axes["years"],
+            axes["regions"],
+        )
+
+    @property
+    def digest(self):
+        """
+        Content digest of values and axes (computed once), for keying
+        caches derived from this cube.
+        """
+        if self._digest is None:
+            h = hashlib.blake2b(digest_size=16)
+            h.update(np.ascontiguousarray(self.values).tobytes())
+            h.update(
+                repr(
+                    (self.indicators, self.countries, self.years.tolist(), self.regions.tolist())
+                ).encode()
+            )
+            self._digest = h.hexdigest()
+        return self._digest
+
+    # --- Axis lookups ---
+
+    def has_indicator(self, indicator):
+        return indicator in self._indicator_pos
+
+    def has_country(self, country):
+        return country in self._country_pos
+
+    def countries_in_region(self, region):
+        return [c for c, r in zip(self.countries, self.regions) if r == region]
+
+    def year_slice(self, year_range=None):
+        if year_range is None:
+            return slice(None)
+        start = int(np.searchsorted(self.years, year_range[0], side="left"))
+        stop = int(np.searchsorted(self.years, year_range[1], side="right"))
+        return slice(start, stop)
+
+    def country_index(self, countries=None):
+        """
+        Sorted axis positions of `countries` (unknown names are skipped),
+        as a slice when they are contiguous.
+        """
+        if countries is None:
+            return slice(None)
+        pos = np.array(
+            sorted({self._country_pos[c] for c in countries if c in self._country_pos}),
+            dtype="int64",
+        )
+        if len(pos) == 0:
+            return pos
+        if pos[-1] - pos[0] + 1 == len(pos):
+            return slice(int(pos[0]), int(pos[-1]) + 1)
+        return pos
+
+    # --- Queries ---
+
+    def select(self, indicator, countries=None, year_range=None):
+        """
+        Returns the (country, year) block for one indicator, or None if the
+        indicator is not in the cube.
+        """
+        if indicator not in self._indicator_pos:
+            return None
+        block = self.values[self._indicator_pos[indicator]]
+        block = block[self.country_index(countries)]
+        return block[:, self.year_slice(year_range)]
+
+    def frame(self, indicator, countries=None, year_range=None):
+        """
+        Long-format rows (GeoAreaName, TimePeriod, Indicator, Value, Region) for
+        one indicator, in the same order as filtering the load_data frame.
+        """
+        country_idx = self.country_index(countries)
+        years = self.years[self.year_slice(year_range)]
+        block = self.select(indicator, countries, year_range)
+        if block is None or block.size == 0:
+            return pd.DataFrame(
+                columns=["GeoAreaName", "TimePeriod", "Indicator", "Value", "Region"]
+            )
+
+        country_pos = np.arange(len(self.countries))[country_idx]
+        flat = block.ravel()
+        keep = np.flatnonzero(~np.isnan(flat))
+        rows = country_pos[keep // len(years)]
+        return pd.DataFrame(
+            {
+                "GeoAreaName": pd.Categorical.from_codes(rows, categories=self.countries),
+                "TimePeriod": years[keep % len(years)],
+                "Indicator": pd.Categorical.from_codes(
+                    np.zeros(len(keep), dtype="int8"), categories=[indicator]
+                ),
+                "Value": flat[keep],
+                "Region": pd.Categorical(self.regions[rows]),
+            }
+        )
+
+    def cross_section(self, indicators, year):
+        """
+        Country x indicator table for one year, like
+        pivot_table(index="GeoAreaName", columns="Indicator") on that year's rows:
+        indicators without data are dropped, as are countries without any value.
+        """
+        year_idx = self.year_slice((year, year))
+        ind_pos = [self._indicator_pos[i] for i in indicators if i in self._indicator_pos]
+        if not ind_pos or year_idx.start == year_idx.stop:
+            return pd.DataFrame()
+
+        table = pd.DataFrame(
+            self.values[ind_pos, :, year_idx.start].T,
+            index=pd.Index(self.countries, name="GeoAreaName"),
+            columns=pd.Index([self.indicators[i] for i in ind_pos], name="Indicator"),
+        )
+        return table.dropna(how="all").dropna(axis=1, how="all")
+
+
+_READ_ONLY_MESSAGE = "shared frame is read-only; modify a .copy() instead"
+
+
+class SharedFrame(pd.DataFrame):
+    """
+    DataFrame shared between sessions (see read_only). Writes to its values
+    raise (the arrays are read-only), and so do the structural changes that
+    would otherwise alter it for every session: column assignment, insertion
+    and deletion, `inplace=True` methods (rename, drop, sort_values, dropna,
+    query, ...), rows added through .loc, and replacing `columns` or `index`.
+    Frames derived from it (filters, sorts, copies) are ordinary DataFrames.
+
+    The axis Index objects themselves are not frozen: `df.index.name = ...`
+    still renames the shared axis.
+    """
+
+    @property
+    def _constructor(self):
+        return pd.DataFrame
+
+    def __setitem__(self, key, value):
+        raise TypeError(_READ_ONLY_MESSAGE)
+
+    def __delitem__(self, key):
+        raise TypeError(_READ_ONLY_MESSAGE)
+
+    def insert(self, *args, **kwargs):
+        raise TypeError(_READ_ONLY_MESSAGE)
+
+    def __setattr__(self, name, value):
+        # inplace=True methods and .loc enlargement swap in a new block manager
+        if name == "_mgr" and "_mgr" in self.__dict__:
+            raise TypeError(_READ_ONLY_MESSAGE)
+        super().__setattr__(name, value)
+
+    def _set_axis(self, axis, labels):
+        # Assignments to .columns and .index
+        raise TypeError(_READ_ONLY_MESSAGE)
+
+    def _consolidate_inplace(self):
+        # Reads may consolidate blocks of one dtype; the values stay the same
+        object.__setattr__(self, "_mgr", self._mgr.consolidate())
+
+
+def read_only(df):
+    """
+    Returns df as a SharedFrame whose NumPy columns and categorical codes are
+    read-only arrays, so in-place writes raise as well. No values are copied:
+    the frame is rebuilt around read-only views of df's columns.
+    """
+    columns = {}
+    for name in df.columns:
+        column = df[name]
+        if isinstance(column.dtype, pd.CategoricalDtype):
+            columns[name] = pd.Categorical.from_codes(
+                _frozen(column.cat.codes.to_numpy()), dtype=column.dtype
+            )
+        elif isinstance(column.dtype, np.dtype):
+            columns[name] = _frozen(column.to_numpy())
+        else:
+            columns[name] = column.array
+    return SharedFrame(columns, index=df.index, columns=df.columns, copy=False)
+
+
+def _frozen(values):
+    values = values.view()
+    values.setflags(write=False)
+    return values
+
+
+# Filtered frames for one dashboard selection
+FilterSlices = namedtuple("FilterSlices", ["charts", "map"])
+
+
+class SliceCache:
+    """
+    Bounded LRU memo of the dashboard's filtered frames, keyed by
+    (indicator, year_range, frozenset(countries), region).
+
+    Thread-safe, so one instance serves every session of a dataset edition.
+    Returned frames are shared, so they are returned read-only (see read_only).
+    """
+
+    def __init__(self, cube, maxsize=256):
+        self.cube = cube
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, indicator, year_range, countries, region, region_countries):
+        """
+        Returns FilterSlices(charts, map): the selected countries' rows and the
+        rows of every country offered for `region` (region_countries), both
+        for `indicator` within year_range.
+        """
+        key = (indicator, tuple(year_range), frozenset(countries), region)
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key]
+            self.misses += 1
+
+        # Built outside the lock; a concurrent miss on the same key builds an equal copy
+        with span("filter.charts"):
+            charts = read_only(self.cube.frame(indicator, countries, year_range))
+        with span("filter.map"):
+            map_ = read_only(self.cube.frame(indicator, region_countries, year_range))
+        slices = FilterSlices(charts, map_)
+        with self._lock:
+            self._entries[key] = slices
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+        return slices
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+
+def _sidecar(path):
+    return os.path.splitext(path)[0] + ".json"
@@ -1,95 +1,347 @@
-import pandas as pd
-import numpy as np
+"""
+Synthetic UN SDG export for load testing.
+
+Usage (from the appSDG folder):
+    python data/generate_mock_data.py [--rows 10000000] [--out data/SDG_synthetic.csv.gz]
+
+Writes rows in the SDG_final.csv column layout that exercise every branch of
+load_data: the tracked countries and indicators next to untracked geo areas and
+series (dropped by the filters), Sex/Location/Age breakdowns around each
+aggregate (some aggregates with the columns left blank), repeated reports of the
+same cell, year gaps, years outside the reporting window and non-numeric values
+("<2.5", "NaN").
+
+Rows are generated a block of geo areas at a time with NumPy and streamed to
+disk, so memory stays flat whatever --rows is. Compression follows the file
+extension (.gz, .bz2, .xz, .zip, or .zst with the zstandard package).
+"""
+import argparse
+import bz2
+import functools
+import gzip
+import io
+import lzma
 import os
+import sys
+import time
+import zipfile
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from utils_constants import GEO_AREA_CODES  # noqa: E402
+
+COLUMNS = [
+    "Goal",
+    "Target",
+    "Indicator",
+    "SeriesCode",
+    "SeriesDescription",
+    "GeoAreaCode",
+    "GeoAreaName",
+    "TimePeriod",
+    "Value",
+    "Time_Detail",
+    "UpperBound",
+    "LowerBound",
+    "Source",
+    "FootNote",
+    "Age",
+    "Location",
+    "Nature",
+    "Observation Status",
+    "Reporting Type",
+    "Sex",
+    "Units",
+]
+
+# (indicator, goal, target, series code, description, units, source,
+#  aggregate age, level, yearly change, cap); 1.1.1 is not tracked by the app
+SERIES = [
+    ("2.1.1", 2, 2.1, "SN_ITK_DEFC", "Prevalence of undernourishment (%)",
+     "PERCENT", "Food and Agriculture Organization of the United Nations (FAO)",
+     "ALLAGE", 12.0, -0.25, 100.0),
+    ("2.2.1", 2, 2.2, "SH_STA_STNT", "Proportion of children moderately or severely stunted (%)",
+     "PER_POP_U5", "Joint Child Malnutrition Estimates (UNICEF, WHO, World Bank Group)",
+     "<5Y", 30.0, -0.6, 100.0),
+    ("3.1.1", 3, 3.1, "SH_STA_MORT", "Maternal mortality ratio",
+     "PER_100000_LIVE_BIRTHS", "Maternal Mortality Estimation Inter-agency Group (MMEIG)",
+     "ALLAGE", 150.0, -4.0, 1000.0),
+    ("3.2.1", 3, 3.2, "SH_DYN_MORT", "Under-five mortality rate, by sex (deaths per 1,000 live births)",
+     "PER_1000_LIVE_BIRTHS", "UN Inter-agency Group for Child Mortality Estimation (UN IGME)",
+     "<5Y", 45.0, -1.5, 300.0),
+    ("6.1.1", 6, 6.1, "SH_H2O_SAFE", "Proportion of population using safely managed drinking water services, by urban/rural (%)",
+     "PERCENT", "WHO/UNICEF Joint Monitoring Programme for Water Supply, Sanitation and Hygiene (JMP)",
+     "ALLAGE", 50.0, 1.2, 100.0),
+    ("6.2.1", 6, 6.2, "SH_SAN_SAFE", "Proportion of population using safely managed sanitation services, by urban/rural (%)",
+     "PERCENT", "WHO/UNICEF Joint Monitoring Programme for Water Supply, Sanitation and Hygiene (JMP)",
+     "ALLAGE", 40.0, 1.4, 100.0),
+    ("1.1.1", 1, 1.1, "SI_POV_DAY1", "Proportion of population below international poverty line (%)",
+     "PERCENT", "World Bank",
+     "ALLAGE", 20.0, -0.5, 100.0),
+]  # fmt: skip
+
+# Series reported for women only (their aggregate row is FEMALE, like the export)
+FEMALE_ONLY = {"SH_STA_MORT"}
+
+# Disaggregations emitted per series and cell: (Sex, Location, Age, value factor).
+# Sex "*" and Age "*" stand for the aggregate values of the series.
+VARIANTS = [
+    ("*", "ALLAREA", "*", 1.00),
+    ("MALE", "ALLAREA", "*", 1.06),
+    ("FEMALE", "ALLAREA", "*", 0.94),
+    ("*", "URBAN", "*", 0.85),
+    ("*", "RURAL", "*", 1.12),
+    ("*", "ALLAREA", "15-49", 1.05),
+]
+
+YEARS = range(2000, 2025)
+
+# Shares of the generated cells
+GAP_RATE = 0.25  # (area, series, year) cells not reported at all
+DUPLICATE_RATE = 0.05  # rows reported a second time, by another source
+BLANK_RATE = 0.10  # aggregate rows with Sex/Location/Age left empty
+NAN_RATE = 0.005  # rows with "NaN" as the value
+
+# Values below this are published as "<2.5" in percentage series
+CENSOR_BELOW = 2.5
+
+# Geo areas generated (and written) together
+AREAS_PER_BLOCK = 1000
+
+# Synthetic geo areas after the tracked countries: "Area 00001", code 1001, ...
+SYNTHETIC_CODE_BASE = 1000
+
+
+def area_block(start, count):
+    """Names and M49-like codes of geo areas start .. start+count-1."""
+    tracked = list(GEO_AREA_CODES.items())
+    names, codes = [], []
+    for i in range(start, start + count):
+        if i < len(tracked):
+            name, code = tracked[i]
+        else:
+            n = i - len(tracked) + 1
+            name, code = f"Area {n:05d}", SYNTHETIC_CODE_BASE + n
+        names.append(name)
+        codes.append(code)
+    return names, np.array(codes)
+
+
+def rows_per_area():
+    """Expected rows generated per geo area (before the last block is cut)."""
+    variants = sum(1 if s[3] in FEMALE_ONLY else len(VARIANTS) for s in SERIES)
+    return len(YEARS) * (1 - GAP_RATE) * variants * (1 + DUPLICATE_RATE)
+
+
+def generate_block(names, codes, rng):
+    """
+    Every row of the given geo areas as CSV lines (object array of str, no
+    line terminators) in the export's column layout.
+    """
+    n_areas, n_series, n_years = len(names), len(SERIES), len(YEARS)
+    years = np.asarray(YEARS)
+    level = np.array([s[8] for s in SERIES])
+    slope = np.array([s[9] for s in SERIES])
+    cap = np.array([s[10] for s in SERIES])
 
-# Configuration
-COUNTRIES = {
-    "South Asia": ["India", "Pakistan", "Bangladesh", "Nepal", "Sri Lanka", "Bhutan"],
-    "South East Asia": [
-        "Indonesia",
-        "Viet Nam",
-        "Thailand",
-        "Myanmar",
-        "Malaysia",
-        "Philippines",
-        "Singapore",
-    ],
-}
-
-INDICATORS = {
-    "SDG 2": [
-        "Prevalence of Undernourishment (%)",
-        "Stunting in Children < 5 Years (%)",
-    ],
-    "SDG 3": [
-        "Maternal Mortality Ratio (per 100k births)",
-        "Under-5 Mortality Rate (per 1,000 live births)",
-    ],
-    "SDG 6": ["Safely Managed Drinking Water (%)", "Open Defecation Practice (%)"],
-}
-
-
-def generate_data():
-    np.random.seed(42)
-    records = []
-    years = range(2000, 2025)
-
-    for region, country_list in COUNTRIES.items():
-        for country in country_list:
-            # Add some country-specific bias
-            country_bias = np.random.uniform(-10, 10)
-            if country == "India":
-                country_bias = 0  # Baseline
-            elif country == "Singapore":
-                country_bias = 40  # High performer bias
-
-            for sdg, inds in INDICATORS.items():
-                for ind in inds:
-                    # Determine base value and trend direction
-                    if (
-                        "Mortality" in ind
-                        or "Stunting" in ind
-                        or "Undernourishment" in ind
-                        or "Defecation" in ind
-                    ):
-                        # Negative indicators (lower is better)
-                        base_val = 50 + country_bias
-                        trend = -0.8  # Improving over time
-                    else:
-                        # Positive indicators (higher is better)
-                        base_val = 60 + country_bias
-                        trend = 0.8  # Improving over time
-
-                    current_val = max(0, min(100, base_val))
-
-                    for i, year in enumerate(years):
-                        # Add trend and noise
-                        noise = np.random.normal(0, 1.5)
-                        val = current_val + (trend * i) + noise
-
-                        # Clamp values
-                        val = max(0, min(100, val))
-
-                        records.append(
-                            {
-                                "GeoAreaName": country,
-                                "TimePeriod": year,
-                                "Indicator": ind,
-                                "Value": round(val, 2),
-                                "SDG": sdg,
-                                "Region": region,
-                            }
-                        )
-
-    df = pd.DataFrame(records)
-
-    # Save to the specific path the app expects (root of the workspace or data folder)
-    # The app code expects "final_sdg_data.csv" in the current directory.
-    output_path = os.path.join(os.path.dirname(__file__), "..", "final_sdg_data.csv")
-    df.to_csv(output_path, index=False)
-    print(f"Data generated at {output_path}")
-    print(df.head())
+    # Aggregate series: per-area level and pace, a linear trend and noise
+    area_level = rng.uniform(0.3, 1.7, (n_areas, n_series))
+    area_pace = rng.uniform(0.5, 1.5, (n_areas, n_series))
+    base = (
+        (level * area_level)[..., None]
+        + (slope * area_pace)[..., None] * (years - years[0])[None, None, :]
+        + rng.normal(0, 0.02, (n_areas, n_series, n_years)) * level[:, None]
+    )
+    base = np.clip(base, 0, cap[:, None])
+
+    # Reported (area, series, year) cells, each with its disaggregation rows
+    area, series, year = np.nonzero(rng.random(base.shape) >= GAP_RATE)
+    female_only = np.array([s[3] in FEMALE_ONLY for s in SERIES])
+    variant_count = np.where(female_only[series], 1, len(VARIANTS))
+    cell = np.repeat(np.arange(len(area)), variant_count)
+    first_row = np.cumsum(variant_count) - variant_count
+    variant = np.arange(len(cell)) - np.repeat(first_row, variant_count)
+
+    # Duplicated reports right after the original row
+    copies = np.where(rng.random(len(cell)) < DUPLICATE_RATE, 2, 1)
+    cell, variant = np.repeat(cell, copies), np.repeat(variant, copies)
+    duplicate = np.zeros(len(cell), dtype=bool)
+    duplicate[np.cumsum(copies)[copies == 2] - 1] = True
+
+    area, series, year = area[cell], series[cell], year[cell]
+    factor = np.array([v[3] for v in VARIANTS])[variant]
+    noise = rng.normal(1.0, np.where(duplicate, 0.03, 0.01))
+    value = np.clip(base[area, series, year] * factor * noise, 0, cap[series]).round(2)
+    return _csv_rows(names, codes, area, series, years[year], variant, duplicate, value, rng)
+
+
+def _csv_rows(names, codes, area, series, year, variant, duplicate, value, rng):
+    n = len(area)
+    female_only = np.array([s[3] in FEMALE_ONLY for s in SERIES])[series]
+
+    # Disaggregation columns; "*" resolves to the series aggregate
+    sex_labels = ["BOTHSEX", "MALE", "FEMALE", ""]
+    sex = np.array([sex_labels.index(v[0]) if v[0] != "*" else 0 for v in VARIANTS])[variant]
+    sex[female_only] = 2
+    location_labels = ["ALLAREA", "URBAN", "RURAL", ""]
+    location = np.array([location_labels.index(v[1]) for v in VARIANTS])[variant]
+    age_labels = sorted({s[7] for s in SERIES} | {v[2] for v in VARIANTS if v[2] != "*"}) + [""]
+    age_total = np.array([age_labels.index(s[7]) for s in SERIES])[series]
+    age = np.array([age_labels.index(v[2]) if v[2] != "*" else -1 for v in VARIANTS])[variant]
+    age = np.where(age < 0, age_total, age)
+
+    # Some aggregates leave the disaggregation columns empty
+    blank = (variant == 0) & ~female_only & (rng.random(n) < BLANK_RATE)
+    sex[blank], location[blank], age[blank] = 3, 3, len(age_labels) - 1
+
+    # Values are whole hundredths up to the series cap, so their text (and the
+    # text of their bounds) is looked up instead of formatted row by row
+    hundredths = np.rint(value * 100).astype("int64")
+    value_text, bounds_text = _value_tables(int(max(s[10] for s in SERIES) * 100))
+    text = value_text[hundredths]
+    bounds = bounds_text[hundredths]
+    # Censored small percentages and a few "NaN", both without bounds
+    censored = (np.array([s[5] == "PERCENT" for s in SERIES])[series]) & (value < CENSOR_BELOW)
+    missing = rng.random(n) < NAN_RATE
+    text[censored] = f"<{CENSOR_BELOW}"
+    text[missing] = "NaN"
+    bounds[censored | missing] = ","
+
+    # Every other column depends on a few small keys, so each group of columns
+    # is formatted once per key and rows are joined from lookups
+    # Goal .. TimePeriod, by (series, area, year)
+    head_table = np.array(
+        [
+            _csv_line(s[1], s[2], s[0], s[3], s[4], code, name) + ","
+            for s in SERIES
+            for name, code in zip(names, codes)
+        ],
+        dtype=object,
+    )[:, None] + np.array([f"{y}," for y in YEARS], dtype=object)
+    head = head_table.ravel()[(series * len(names) + area) * len(YEARS) + year - YEARS[0]]
+    # Time_Detail, before the bounds
+    detail = np.array([f",{y}," for y in YEARS], dtype=object)[year - YEARS[0]]
+    # Source .. Units, by (series, duplicate, age, location, sex)
+    flags = [("", "M", "A"), ("Revised estimate.", "E", "E")]
+    tail_table = np.array(
+        [
+            "," + _csv_line(s[6], note, a, loc, nature, status, "G", sex_, s[5])
+            for s in SERIES
+            for note, nature, status in flags
+            for a in age_labels
+            for loc in location_labels
+            for sex_ in sex_labels
+        ],
+        dtype=object,
+    )
+    key = (
+        (series * len(flags) + duplicate) * len(age_labels) + age
+    ) * len(location_labels) + location
+    tail = tail_table[key * len(sex_labels) + sex]
+
+    return head + text + detail + bounds + tail
+
+
+@functools.lru_cache(maxsize=None)
+def _value_tables(max_hundredths):
+    """
+    Text of every value 0.00 .. max_hundredths / 100 and of its
+    "UpperBound,LowerBound" pair (+-5%), indexed by hundredths.
+    """
+    values = np.arange(max_hundredths + 1) / 100
+    upper = (values * 1.05).round(2).astype(str)
+    lower = (values * 0.95).round(2).astype(str)
+    return (
+        values.astype(str).astype(object),
+        np.char.add(np.char.add(upper, ","), lower).astype(object),
+    )
+
+
+def _csv_line(*fields):
+    # Fields quoted only when they need it, like the export
+    out = []
+    for field in map(str, fields):
+        if any(c in field for c in ',"\n'):
+            field = '"' + field.replace('"', '""') + '"'
+        out.append(field)
+    return ",".join(out)
+
+
+def open_output(path, member=None):
+    """
+    Text handle for streaming CSV to `path`, compressed by its extension.
+    `member` names the file inside a .zip (default: `path` without ".zip").
+    """
+    if path.endswith(".gz"):
+        return gzip.open(path, "wt", compresslevel=1, newline="")
+    if path.endswith(".bz2"):
+        return bz2.open(path, "wt", newline="")
+    if path.endswith(".xz"):
+        return lzma.open(path, "wt", preset=1, newline="")
+    if path.endswith(".zst"):
+        try:
+            import zstandard
+        except ImportError:
+            raise ImportError("Writing .zst files needs the zstandard package") from None
+        return zstandard.open(path, "wt", newline="")
+    if path.endswith(".zip"):
+        archive = zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED, compresslevel=1)
+        member = member or os.path.basename(path)[: -len(".zip")]
+        return _ZipText(archive, archive.open(member, "w", force_zip64=True))
+    return open(path, "w", newline="")
+
+
+class _ZipText(io.TextIOWrapper):
+    # Closes the archive together with its only member
+    def __init__(self, archive, member):
+        super().__init__(member, newline="")
+        self._archive = archive
+
+    def close(self):
+        super().close()
+        self._archive.close()
+
+
+def generate(path, rows, seed=42):
+    """
+    Streams `rows` rows of synthetic export to `path`; returns the geo areas written.
+    """
+    rng = np.random.default_rng(seed)
+    written, start = 0, 0
+    tmp_path = f"{path}.{os.getpid()}.tmp{os.path.splitext(path)[1]}"
+    member = os.path.basename(path)[: -len(".zip")] if path.endswith(".zip") else None
+    try:
+        with open_output(tmp_path, member) as f:
+            f.write(_csv_line(*COLUMNS) + "\n")
+            while written < rows:
+                count = min(AREAS_PER_BLOCK, int((rows - written) / rows_per_area()) + 1)
+                names, codes = area_block(start, count)
+                block = generate_block(names, codes, rng)[: rows - written]
+                f.write("\n".join(block.tolist()) + "\n")
+                written += len(block)
+                start += count
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    os.replace(tmp_path, path)
+    return start
 
 
 if __name__ == "__main__":
-    generate_data()
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument(
+        "--out", default=os.path.join(os.path.dirname(__file__), "SDG_synthetic.csv.gz")
+    )
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    areas = generate(args.out, args.rows, args.seed)
+    print(
+        f"{args.rows:,} rows ({areas:,} geo areas) written to {args.out} "
+        f"in {time.perf_counter() - start:.1f} s ({os.path.getsize(args.out) / 1e6:.1f} MB)"
+    )
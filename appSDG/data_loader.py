@@ -1,145 +1,557 @@
+import hashlib
+import threading
+from collections import namedtuple
+import numpy as np
 import pandas as pd
 import streamlit as st
 import os
+from interpolation import fill_gaps
+from ingest import filter_raw, read_sdg_export, export_columns, DEDUP_KEYS
+from parallel import pipeline_workers, run_parallel
+from cube import SDGCube, SliceCache, read_only
+from radar import RadarTables
+from timing import span
+from utils_constants import (
+    CODE_TO_NAME,
+    GEO_AREA_CODES,
+    INDICATOR_RENAME_MAP,
+    SDG_MAP,
+    SOUTH_ASIA,
+    SE_ASIA,
+)
 
+# Bump whenever the processing steps below change the shape or content of the
+# returned frame, so snapshots written by an older pipeline are ignored.
+PIPELINE_VERSION = 3
 
-@st.cache_data
-def load_data():
-    """
-    Loads and cleans the real SDG data from SDG_final.csv.
-    Applies filtering, mapping, and interpolation.
-    """
-    # 1. Locate File
+SNAPSHOT_DIR = os.path.join(os.path.dirname(__file__), ".cache")
+
+# Reporting window filled by interpolation
+FULL_YEARS = range(2015, 2025)
+
+# Dashboard selections kept in the filtered-slice memo (see SliceCache)
+SLICE_CACHE_SIZE = 256
+
+GEO_AREA_NAMES = {code: name for name, code in GEO_AREA_CODES.items()}
+REGIONS = ["South Asia", "South East Asia", "Other"]
+COUNTRY_REGION = {
+    **{c: "South Asia" for c in SOUTH_ASIA},
+    **{c: "South East Asia" for c in SE_ASIA},
+}
+
+
+def _locate_data_file():
     possible_paths = [
+        # Local mirror written by sdg_sync.py takes precedence over the bundled export
+        os.path.join(os.path.dirname(__file__), "mirror", "SDG_final.csv"),
         "appSDG/SDG_final.csv",
         "SDG_final.csv",
         os.path.join(os.path.dirname(__file__), "SDG_final.csv"),
     ]
-
-    file_path = None
     for path in possible_paths:
         if os.path.exists(path):
-            file_path = path
-            break
+            return path
+    return None
+
+
+def file_digest(file_path, chunk_size=1 << 20):
+    """
+    Returns the SHA-256 hex digest of a file's contents.
+    """
+    h = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def source_fingerprint(file_path):
+    """
+    Cheap change detector for the source file: (path, size, mtime).
+    Checked on every rerun; the content digest is only computed when it moves.
+    """
+    stat = os.stat(file_path)
+    return (os.path.abspath(file_path), stat.st_size, stat.st_mtime_ns)
+
+
+def source_schema(file_path):
+    """
+    Columns the pipeline will read plus the pipeline version. A change here
+    forces a full rebuild instead of an incremental update.
+    """
+    return (tuple(export_columns(file_path)), PIPELINE_VERSION)
+
+
+def snapshot_path(digest, kind="processed"):
+    return os.path.join(
+        SNAPSHOT_DIR, f"sdg_{digest[:16]}_p{PIPELINE_VERSION}.{kind}.parquet"
+    )
+
+
+def read_snapshot(path):
+    """
+    Reads a snapshot frame, or returns None if it is missing or unreadable.
+    """
+    if not os.path.exists(path):
+        return None
+    try:
+        return pd.read_parquet(path)
+    except Exception:
+        return None
+
+
+def write_snapshot(df, path):
+    """
+    Writes a snapshot frame atomically and drops snapshots of other source
+    versions. Failures are ignored: snapshots are an optimisation, not a requirement.
+    """
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        df.to_parquet(tmp_path)
+        os.replace(tmp_path, path)
+    except Exception:
+        return
+
+    _prune_snapshots(path)
+
+
+def cube_path(digest):
+    return os.path.join(SNAPSHOT_DIR, f"sdg_{digest[:16]}_p{PIPELINE_VERSION}.cube.npy")
+
+
+def write_cube(cube, path):
+    """
+    Writes the memory-mappable cube file (see SDGCube.save). Failures are
+    ignored; callers fall back to the in-memory cube.
+    """
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        cube.save(path)
+    except Exception:
+        return
+    _prune_snapshots(path)
+
+
+def _prune_snapshots(path):
+    # Drop files of other source versions. Processes still mapping an old cube
+    # keep their mapping on POSIX; on Windows the removal fails and is retried later.
+    prefix = os.path.basename(path).split(".")[0] + "."
+    for name in os.listdir(SNAPSHOT_DIR):
+        if name.startswith("sdg_") and not name.startswith(prefix):
+            try:
+                os.remove(os.path.join(SNAPSHOT_DIR, name))
+            except OSError:
+                pass
 
+
+def load_data():
+    """
+    Loads the processed SDG data for the current edition of SDG_final.csv.
+    Memoized per source fingerprint, so a replaced file is picked up on the
+    next rerun without restarting the server.
+
+    Every caller gets the same read-only frame (see cube.read_only), with
+    indicator names already renamed; call .copy() before modifying it.
+    """
+    file_path = _locate_data_file()
     if not file_path:
         st.error("Data file 'SDG_final.csv' not found.")
         return pd.DataFrame()
 
+    return _load_data(file_path, source_fingerprint(file_path))
+
+
+@st.cache_resource(max_entries=2)
+def _load_data(file_path, fingerprint):
+    # cache_resource hands out this object itself, not a pickled copy per call
     try:
-        df = pd.read_csv(file_path)
+        return STORE.refresh(file_path, fingerprint).frame
     except Exception as e:
         st.error(f"Error reading CSV: {e}")
-        return pd.DataFrame()
+        return read_only(pd.DataFrame())
 
-    # 2. Filter for Aggregate Data (avoid double counting)
-    # Be more permissive: Keep if value matches target OR is missing/empty (implying total)
-
-    # Sex: Keep BOTHSEX or Null
-    if "Sex" in df.columns:
-        # Standardize for comparison
-        df["Sex"] = df["Sex"].fillna("Total").replace("", "Total")
-        # Keep rows that are explicitly BOTHSEX or interpreted as Total (missing)
-        # Exclude specific breakdowns like MALE/FEMALE if we can rely on BOTHSEX/Total
-        # Exception: Maternal Mortality (3.1.1) is FEMALE only.
-        df = df[df["Sex"].isin(["BOTHSEX", "Total", "FEMALE"])]
-
-    # Location: Keep ALLAREA or Null
-    if "Location" in df.columns:
-        df["Location"] = df["Location"].fillna("Total").replace("", "Total")
-        df = df[df["Location"].isin(["ALLAREA", "Total"])]
-
-    # Age: Keep ALLAGE or <5Y (for child metrics) or Null
-    if "Age" in df.columns:
-        df["Age"] = df["Age"].fillna("Total").replace("", "Total")
-        # Indicators like 2.1.2 use ALLAGE.
-        # Indicators like 3.2.1/2.2.1 use <5Y.
-        # We accept both as valid "aggregates" for their respective indicators.
-        df = df[df["Age"].isin(["ALLAGE", "<5Y", "Total"])]
-
-    # 3. Define Mapping from Raw Code to App Display Name
-    # Matches utils_constants.py exactly
-    CODE_TO_NAME = {
-        "2.1.1": "2.1.1 Prevalence of undernourishment (%)",
-        "2.2.1": "2.2.1 Prevalence of stunting (height for age <-2 SD) (%)",
-        "3.1.1": "3.1.1 Maternal Mortality Ratio (per 100k births)",
-        "3.2.1": "3.2.1 Under-5 Mortality Rate (per 1,000 live births)",
-        "6.1.1": "6.1.1 Proportion of population using safely managed drinking water services (%)",
-        "6.2.1": "6.2.1 Proportion of population using safely managed sanitation services (%)",
-    }
-
-    # 4. Filter and Map Indicators
-    # Ensure string types and strip whitespace
-    if "Indicator" in df.columns:
-        df["Indicator"] = df["Indicator"].astype(str).str.strip()
-    if "GeoAreaName" in df.columns:
-        df["GeoAreaName"] = df["GeoAreaName"].astype(str).str.strip()
-
-    # Ensure 'Indicator' column usually holds the code "2.1.2"
-    df = df[df["Indicator"].isin(CODE_TO_NAME.keys())]
-    df["Indicator"] = df["Indicator"].map(CODE_TO_NAME)
-
-    # 5. Clean Value Column
-    df["Value"] = pd.to_numeric(df["Value"], errors="coerce")
-
-    # 6. Filter Target Countries and Assign Region
-    SOUTH_ASIA = ["India", "Pakistan", "Bangladesh", "Nepal", "Sri Lanka", "Bhutan"]
-    SE_ASIA = [
-        "Indonesia",
-        "Viet Nam",
-        "Thailand",
-        "Myanmar",
-        "Malaysia",
-        "Philippines",
-        "Singapore",
-    ]
-    target_countries = SOUTH_ASIA + SE_ASIA
-    df = df[df["GeoAreaName"].isin(target_countries)]
 
-    # 7. Deduplicate
-    df = (
-        df.groupby(["GeoAreaName", "TimePeriod", "Indicator"])["Value"]
-        .mean()
-        .reset_index()
+def load_cube():
+    """
+    Returns the indexed (indicator, country, year) cube built from load_data,
+    or None when no data is available. Shared read-only across sessions.
+
+    The cube values live in a .npy file under SNAPSHOT_DIR that every server
+    process maps read-only, so they are held once in the page cache however
+    many processes serve the app.
+    """
+    file_path = _locate_data_file()
+    if not file_path:
+        return None
+    return _load_cube(file_path, source_fingerprint(file_path))
+
+
+@st.cache_resource(max_entries=2)
+def _load_cube(file_path, fingerprint):
+    state = STORE.state
+    if state is not None and state.fingerprint == fingerprint:
+        digest = state.digest
+    else:
+        digest = file_digest(file_path)
+
+    # Another process may already have written this edition's cube
+    path = cube_path(digest)
+    cube = SDGCube.open(path)
+    if cube is not None:
+        return cube
+
+    df = _load_data(file_path, fingerprint)
+    if df.empty:
+        return None
+    with span("load.cube"):
+        write_cube(SDGCube.from_frame(df), path)
+        return SDGCube.open(path) or SDGCube.from_frame(df)
+
+
+def load_radar_tables():
+    """
+    Returns the radar chart tables (scaling and regional averages for every
+    year and region context) for the current dataset edition, or None when
+    no data is available. Built once per edition and shared by all sessions.
+    """
+    file_path = _locate_data_file()
+    if not file_path:
+        return None
+    return _load_radar_tables(file_path, source_fingerprint(file_path))
+
+
+@st.cache_resource(max_entries=2)
+def _load_radar_tables(file_path, fingerprint):
+    cube = _load_cube(file_path, fingerprint)
+    if cube is None:
+        return None
+    with span("load.radar_tables"):
+        return RadarTables(cube, SDG_MAP)
+
+
+def load_slice_cache():
+    """
+    Returns the LRU memo of filtered slices for the current dataset edition
+    (shared by all sessions), or None when no data is available.
+    """
+    file_path = _locate_data_file()
+    if not file_path:
+        return None
+    return _load_slice_cache(file_path, source_fingerprint(file_path))
+
+
+@st.cache_resource(max_entries=2)
+def _load_slice_cache(file_path, fingerprint):
+    # Keyed by the source fingerprint, so a new edition starts with an empty memo
+    cube = _load_cube(file_path, fingerprint)
+    if cube is None:
+        return None
+    return SliceCache(cube, SLICE_CACHE_SIZE)
+
+
+# Processed dataset (read-only, shared by every session) plus the dense, not yet
+# interpolated series it was built from (kept so a new edition only
+# re-interpolates the series that changed).
+DatasetState = namedtuple(
+    "DatasetState",
+    ["fingerprint", "digest", "schema", "dense", "filled", "frame", "recomputed"],
+)
+
+
+class DatasetStore:
+    """
+    Process-wide holder of the current dataset edition.
+
+    refresh() compares the source fingerprint, then its content digest, and
+    only rebuilds what changed: same schema and axes -> re-interpolate the
+    (country, indicator) series whose raw values differ; anything else -> full
+    rebuild. The new state is swapped in with a single assignment, so a rerun
+    sees either the old edition or the new one, never a mix. The result equals
+    a full rebuild either way, since changes are detected on the filtered,
+    deduplicated values; the schema check only decides whether to try.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._state = None
+
+    @property
+    def state(self):
+        return self._state
+
+    def refresh(self, file_path, fingerprint=None):
+        fingerprint = fingerprint or source_fingerprint(file_path)
+        state = self._state
+        if state is not None and state.fingerprint == fingerprint:
+            return state
+
+        with self._lock:
+            state = self._state
+            if state is None or state.fingerprint != fingerprint:
+                state = self._update(file_path, fingerprint, state)
+                self._state = state
+            return state
+
+    def _update(self, file_path, fingerprint, state):
+        with span("load.digest"):
+            digest = file_digest(file_path)
+        if state is not None and state.digest == digest:
+            # Touched but not edited
+            return state._replace(fingerprint=fingerprint, recomputed=0)
+
+        schema = source_schema(file_path)
+        if state is not None and state.dense is None:
+            state = _restore_series(state)
+        if state is None or state.schema not in (None, schema):
+            return build_state(file_path, fingerprint=fingerprint, digest=digest)
+
+        with span("load.read_export"):
+            deduped = read_sdg_export(file_path)
+        with span("load.densify"):
+            dense = densify(deduped)
+        with span("load.interpolate"):
+            if _same_axes(dense, state.dense):
+                changed = _changed_series(state.dense.raw, dense.raw)
+                filled = state.filled.copy()
+                filled[changed] = fill_gaps(dense.raw[changed])
+                recomputed = int(changed.sum())
+            else:
+                filled = fill_gaps(dense.raw)
+                recomputed = filled.shape[0] * filled.shape[1]
+
+        with span("load.assemble"):
+            frame = read_only(assemble(dense, filled))
+        with span("load.snapshot_write"):
+            write_snapshot(frame, snapshot_path(digest))
+            write_snapshot(deduped, snapshot_path(digest, "series"))
+        return DatasetState(fingerprint, digest, schema, dense, filled, frame, recomputed)
+
+
+def _restore_series(state):
+    """
+    Fills in the dense series of a snapshot-restored state, or returns None
+    if its series snapshot is gone (forcing a full rebuild).
+    """
+    deduped = read_snapshot(snapshot_path(state.digest, "series"))
+    if deduped is None:
+        return None
+    dense = densify(deduped)
+    return state._replace(dense=dense, filled=fill_gaps(dense.raw))
+
+
+def _same_axes(a, b):
+    return np.array_equal(a.geo_codes, b.geo_codes) and list(a.indicator_codes) == list(
+        b.indicator_codes
     )
 
-    # 8. Linear Interpolation
-    df_pivot = df.pivot(
-        index=["GeoAreaName", "TimePeriod"], columns="Indicator", values="Value"
-    ).reset_index()
-
-    full_years = range(2015, 2025)
-    countries = df_pivot["GeoAreaName"].unique()
-    grid = []
-    for country in countries:
-        for year in full_years:
-            grid.append({"GeoAreaName": country, "TimePeriod": year})
-    df_grid = pd.DataFrame(grid)
-
-    df_merged = pd.merge(
-        df_grid, df_pivot, on=["GeoAreaName", "TimePeriod"], how="left"
+
+def _changed_series(old, new):
+    """
+    (country, indicator) mask of series whose raw yearly values differ.
+    """
+    same = (old == new) | (np.isnan(old) & np.isnan(new))
+    return ~same.all(axis=-1)
+
+
+STORE = DatasetStore()
+
+
+def build_state(file_path, use_snapshot=True, fingerprint=None, digest=None):
+    """
+    Runs the full pipeline for file_path (or restores it from snapshots) and
+    returns a DatasetState. With use_snapshot=False nothing is read or written.
+    """
+    if digest is None:
+        with span("load.digest"):
+            digest = file_digest(file_path)
+
+    if use_snapshot:
+        with span("load.snapshot_read"):
+            frame = read_snapshot(snapshot_path(digest))
+        if frame is not None:
+            # Schema and dense series are restored lazily, only if an update needs them
+            return DatasetState(fingerprint, digest, None, None, None, read_only(frame), 0)
+
+    schema = source_schema(file_path)
+
+    workers = pipeline_workers()
+    if workers > 1:
+        # Steps 2-8 split by country across a process pool (same result as below)
+        with span("load.parallel"):
+            deduped, *arrays = run_parallel(file_path, workers, years=FULL_YEARS)
+            dense, filled = label_axes(*arrays)
+    else:
+        # Steps 2-7 run chunk by chunk while the export is streamed
+        with span("load.read_export"):
+            deduped = read_sdg_export(file_path)
+        with span("load.densify"):
+            dense = densify(deduped)
+        with span("load.interpolate"):
+            filled = fill_gaps(dense.raw)
+    with span("load.assemble"):
+        frame = read_only(assemble(dense, filled))
+
+    if use_snapshot:
+        with span("load.snapshot_write"):
+            write_snapshot(frame, snapshot_path(digest))
+            write_snapshot(deduped, snapshot_path(digest, "series"))
+    return DatasetState(
+        fingerprint, digest, schema, dense, filled, frame, filled.shape[0] * filled.shape[1]
     )
 
-    indicator_cols = [c for c in df_merged.columns if c not in ["GeoAreaName", "TimePeriod"]]
-    df_interpolated = df_merged.copy()
-    df_interpolated[indicator_cols] = (
-        df_merged.groupby("GeoAreaName")[indicator_cols]
-        .transform(lambda x: x.interpolate(method="linear", limit_direction="both"))
+
+def load_processed(file_path, use_snapshot=True):
+    """
+    Returns the processed frame for file_path without Streamlit caching.
+    With use_snapshot=False the full pipeline always runs and nothing is written.
+    """
+    return build_state(file_path, use_snapshot).frame
+
+
+def process_raw(df):
+    """
+    Cleans an in-memory raw SDG_final.csv frame.
+    Applies filtering, mapping, and interpolation.
+    """
+    df = filter_raw(df)
+
+    # 7. Deduplicate
+    df = df.groupby(DEDUP_KEYS, observed=True)["Value"].mean().reset_index()
+
+    return finalize(df)
+
+
+def finalize(df):
+    """
+    Interpolates a deduplicated, code-keyed frame onto the reporting window and
+    attaches categorical display labels and regions.
+    """
+    dense = densify(df)
+    return assemble(dense, fill_gaps(dense.raw))
+
+
+# Dense (country, indicator, year) values before interpolation, with axis keys
+DenseSeries = namedtuple(
+    "DenseSeries", ["geo_codes", "names", "indicator_codes", "labels", "raw"]
+)
+
+
+def densify(df):
+    """
+    Packs a deduplicated, code-keyed frame into a DenseSeries.
+    """
+    # 8. Linear Interpolation on a dense (country, indicator, year) array
+    geo_codes, indicator_codes, values = to_dense(df, keys=DEDUP_KEYS[::2])
+    return label_axes(geo_codes, indicator_codes, values)[0]
+
+
+def label_axes(geo_codes, indicator_codes, raw, *aligned):
+    """
+    Wraps dense arrays on sorted code axes into a DenseSeries, reordering the
+    country axis by display name. Arrays in `aligned` (e.g. the interpolated
+    values) get the same reordering; returns (dense, *aligned).
+    """
+    # Country axis in display-name order so charts list countries as before
+    names = np.array([GEO_AREA_NAMES[c] for c in geo_codes], dtype=object)
+    order = np.argsort(names, kind="stable")
+    labels = [CODE_TO_NAME[c] for c in indicator_codes]
+    # Rename Indicators to include codes (legacy names from the mock dataset)
+    labels = np.array([INDICATOR_RENAME_MAP.get(n, n) for n in labels], dtype=object)
+
+    dense = DenseSeries(
+        geo_codes[order].astype("int16"),
+        names[order],
+        np.asarray(indicator_codes, dtype=object),
+        labels,
+        raw[order],
     )
+    return (dense,) + tuple(a[order] for a in aligned)
 
-    df_final = df_interpolated.melt(
-        id_vars=["GeoAreaName", "TimePeriod"], var_name="Indicator", value_name="Value"
-    ).dropna(subset=["Value"])
 
-    # 9. Assign Region Column
-    country_to_region = {}
-    for c in SOUTH_ASIA:
-        country_to_region[c] = "South Asia"
-    for c in SE_ASIA:
-        country_to_region[c] = "South East Asia"
+def assemble(dense, filled):
+    """
+    Melts interpolated dense values into the long categorical frame.
+    """
+    df_final = from_dense(
+        pd.Categorical(dense.names, categories=dense.names),
+        pd.Categorical(dense.labels, categories=dense.labels),
+        filled,
+    )
 
-    df_final["Region"] = df_final["GeoAreaName"].map(country_to_region)
-    # Fallback to avoid NaNs if any country is missed (though target list prevents this)
-    df_final["Region"] = df_final["Region"].fillna("Other")
+    # 9. Assign Region and Code Columns (integer lookups on category codes)
+    country_pos = df_final["GeoAreaName"].cat.codes.to_numpy()
+    region_pos = np.array(
+        [REGIONS.index(COUNTRY_REGION.get(name, "Other")) for name in dense.names],
+        dtype="int8",
+    )
+    df_final["Region"] = pd.Categorical.from_codes(
+        region_pos[country_pos], categories=REGIONS
+    ).remove_unused_categories()
+    df_final["GeoAreaCode"] = dense.geo_codes[country_pos]
+    df_final["IndicatorCode"] = pd.Categorical.from_codes(
+        df_final["Indicator"].cat.codes, categories=dense.indicator_codes
+    )
 
     return df_final
+
+
+def to_dense(df, years=FULL_YEARS, keys=("GeoAreaName", "Indicator")):
+    """
+    Packs a deduplicated long frame into a (country, indicator, year) array.
+    Returns (countries, indicators, values) where the axes are the sorted
+    unique values of the two `keys` columns; rows outside `years` are dropped.
+    """
+    years = np.asarray(years)
+    country_codes, countries = pd.factorize(df[keys[0]], sort=True)
+    indicator_codes, indicators = pd.factorize(df[keys[1]], sort=True)
+    year_pos = np.asarray(df["TimePeriod"].to_numpy() - years[0], dtype="int64")
+    in_window = (year_pos >= 0) & (year_pos < len(years))
+
+    values = np.full((len(countries), len(indicators), len(years)), np.nan)
+    values[
+        country_codes[in_window], indicator_codes[in_window], year_pos[in_window]
+    ] = df["Value"].to_numpy(dtype="float64")[in_window]
+    return np.asarray(countries), np.asarray(indicators), values
+
+
+def _take(axis, positions):
+    if isinstance(axis, pd.Categorical):
+        return pd.Categorical.from_codes(axis.codes[positions], dtype=axis.dtype)
+    return np.asarray(axis)[positions]
+
+
+def from_dense(
+    countries, indicators, values, years=FULL_YEARS, keys=("GeoAreaName", "Indicator")
+):
+    """
+    Melts a (country, indicator, year) array back to the long format, in the
+    same row order and index as the pivot/melt pipeline, dropping empty cells.
+    Axis labels may be arrays or Categoricals (which stay categorical).
+    """
+    years = np.asarray(years)
+    n_c, n_i, n_y = values.shape
+    flat = values.transpose(1, 0, 2).ravel()
+    keep = np.flatnonzero(~np.isnan(flat))
+    return pd.DataFrame(
+        {
+            keys[0]: _take(countries, np.tile(np.repeat(np.arange(n_c), n_y), n_i)[keep]),
+            "TimePeriod": np.tile(years.astype("int64"), n_i * n_c)[keep],
+            keys[1]: _take(indicators, np.repeat(np.arange(n_i), n_c * n_y)[keep]),
+            "Value": flat[keep],
+        },
+        index=keep,
+    )
+
+
+def fill_year_grid(
+    df, years=FULL_YEARS, method="linear", edge="hold", keys=("GeoAreaName", "Indicator")
+):
+    """
+    Reindexes each (country, indicator) series onto `years` and fills the gaps
+    with the vectorised engine in interpolation.fill_gaps.
+    """
+    countries, indicators, values = to_dense(df, years, keys)
+    return from_dense(
+        countries, indicators, fill_gaps(values, method, edge), years, keys
+    )
@@ -0,0 +1,283 @@
+"""
+Bundled country outlines for the choropleth.
+
+Usage (from the appSDG folder):
+    python geo.py [--source URL_OR_PATH]
+
+Extracts the covered countries from Natural Earth's 1:110m admin-0 outlines,
+keys them by M49 code and writes one simplified variant per map zoom level to
+data/geo/. The default source is the naturalearth_lowres shapefile shipped in
+the geopandas 0.14.4 wheel on PyPI (read with pyshp, checked against
+WORLD_SOURCE_SHA256), which reproduces the bundled files exactly; a local copy
+of that wheel or a world GeoJSON whose feature ids are ISO3 codes also works. Borders shared by two
+countries are simplified once as a single arc, so neighbours still meet
+exactly at every level. load_geojson(zoom) parses a variant once per process.
+"""
+import argparse
+import functools
+import hashlib
+import io
+import json
+import math
+import os
+import urllib.request
+import zipfile
+
+from utils_constants import GEO_AREA_CODES, ISO3_CODES
+
+WORLD_SOURCE_URL = (
+    "https://files.pythonhosted.org/packages/3e/b0/"
+    "69fa7a0f55122847506a42fea6988d03b34136938082f142151bc9d9f7e7/"
+    "geopandas-0.14.4-py3-none-any.whl"
+)
+WORLD_SOURCE_SHA256 = "3bb6473cb59d51e1a7fe2dbc24a1a063fb0ebdeddf3ce08ddbf8c7ddc99689aa"
+
+# Natural Earth 1:110m admin-0 countries inside the wheel (.shp, .dbf, .cpg)
+WORLD_SHAPEFILE = "geopandas/datasets/naturalearth_lowres/naturalearth_lowres"
+
+GEO_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "geo")
+
+# Mapbox zoom levels a variant is written for
+ZOOM_LEVELS = (3, 5, 7)
+
+
+def variant_path(zoom):
+    return os.path.join(GEO_DIR, f"countries.z{zoom}.geojson")
+
+
+def tolerance(zoom):
+    """
+    Simplification tolerance in degrees: half a 256 px tile pixel at `zoom`.
+    """
+    return 360 / (256 * 2**zoom) / 2
+
+
+@functools.lru_cache(maxsize=None)
+def load_geojson(zoom=ZOOM_LEVELS[0]):
+    """
+    Parsed outlines (features keyed by M49 `id`) for the coarsest variant that
+    is still detailed enough for `zoom`. Read from disk once per process.
+    """
+    level = min((z for z in ZOOM_LEVELS if z >= zoom), default=ZOOM_LEVELS[-1])
+    with open(variant_path(level)) as f:
+        return json.load(f)
+
+
+# --- Build step ---
+
+
+def read_world(source):
+    """
+    World outlines as a GeoJSON FeatureCollection with ISO3 feature ids, from
+    the geopandas wheel (URL or path; its checksum must match) or a GeoJSON file.
+    """
+    if source.startswith(("http://", "https://")):
+        with urllib.request.urlopen(source, timeout=60) as resp:
+            data = resp.read()
+    else:
+        with open(source, "rb") as f:
+            data = f.read()
+    if not zipfile.is_zipfile(io.BytesIO(data)):
+        return json.loads(data)
+
+    digest = hashlib.sha256(data).hexdigest()
+    if digest != WORLD_SOURCE_SHA256:
+        raise ValueError(f"{source}: sha256 {digest}, expected {WORLD_SOURCE_SHA256}")
+    try:
+        import shapefile
+    except ImportError:
+        raise ImportError("Reading the Natural Earth shapefile needs the pyshp package") from None
+    with zipfile.ZipFile(io.BytesIO(data)) as wheel:
+        reader = shapefile.Reader(
+            shp=io.BytesIO(wheel.read(f"{WORLD_SHAPEFILE}.shp")),
+            dbf=io.BytesIO(wheel.read(f"{WORLD_SHAPEFILE}.dbf")),
+            encoding=wheel.read(f"{WORLD_SHAPEFILE}.cpg").decode().strip(),
+        )
+        features = [
+            {
+                "type": "Feature",
+                "id": record.record["iso_a3"],
+                "properties": {"name": record.record["name"]},
+                "geometry": record.shape.__geo_interface__,
+            }
+            for record in reader.iterShapeRecords()
+        ]
+    return {"type": "FeatureCollection", "features": features}
+
+
+def extract_countries(world):
+    """
+    Features of the covered countries as {m49: (name, [polygon, ...])}, each
+    polygon a list of rings without the closing point. Countries missing from
+    the source (Singapore is below 1:110m resolution) are skipped.
+    """
+    by_iso3 = {feature.get("id"): feature for feature in world["features"]}
+    countries = {}
+    for name, iso3 in ISO3_CODES.items():
+        feature = by_iso3.get(iso3)
+        if feature is None:
+            continue
+        geometry = feature["geometry"]
+        polygons = geometry["coordinates"]
+        if geometry["type"] == "Polygon":
+            polygons = [polygons]
+        countries[GEO_AREA_CODES[name]] = (
+            name,
+            [[[tuple(p) for p in ring[:-1]] for ring in polygon] for polygon in polygons],
+        )
+    return countries
+
+
+def simplify_countries(countries, tol):
+    """
+    Douglas-Peucker simplification of every ring, done per arc: rings are cut
+    wherever the set of rings sharing a vertex changes, and each arc is
+    simplified once in a canonical direction, so both sides of a border get
+    the same points. Islands smaller than `tol` are dropped; a ring that would
+    collapse keeps its original points.
+    """
+    users = {}
+    for code, (_, polygons) in countries.items():
+        for p, polygon in enumerate(polygons):
+            for r, ring in enumerate(polygon):
+                for point in ring:
+                    users.setdefault(point, set()).add((code, p, r))
+
+    arcs = {}
+    simplified = {}
+    for code, (name, polygons) in countries.items():
+        largest = max(range(len(polygons)), key=lambda i: _extent(polygons[i][0]))
+        kept = []
+        for p, polygon in enumerate(polygons):
+            if p != largest and _extent(polygon[0]) < tol:
+                continue
+            kept.append([_simplify_ring(ring, users, arcs, tol) for ring in polygon])
+        simplified[code] = (name, kept)
+    return simplified
+
+
+def _simplify_ring(ring, users, arcs, tol):
+    n = len(ring)
+    fixed = [
+        i
+        for i in range(n)
+        if users[ring[i]] != users[ring[i - 1]] or users[ring[i]] != users[ring[(i + 1) % n]]
+    ]
+    if not fixed:
+        # Unshared loop: anchor it at its first point and the point farthest from it
+        far = max(range(n), key=lambda i: math.dist(ring[0], ring[i]))
+        fixed = [0, far] if far else [0]
+
+    out = []
+    for a, b in zip(fixed, fixed[1:] + [fixed[0] + n]):
+        arc = [ring[i % n] for i in range(a, b + 1)]
+        out.extend(_simplify_arc(arc, arcs, tol)[:-1])
+    return out if len(out) >= 3 else ring
+
+
+def _simplify_arc(arc, arcs, tol):
+    reverse = arc[::-1]
+    key = tuple(min(arc, reverse))
+    if key not in arcs:
+        arcs[key] = _douglas_peucker(list(key), tol)
+    result = arcs[key]
+    return result if tuple(arc) == key else result[::-1]
+
+
+def _douglas_peucker(points, tol):
+    if len(points) < 3:
+        return points
+    keep = [False] * len(points)
+    keep[0] = keep[-1] = True
+    stack = [(0, len(points) - 1)]
+    while stack:
+        start, end = stack.pop()
+        index, distance = 0, 0.0
+        for i in range(start + 1, end):
+            d = _segment_distance(points[i], points[start], points[end])
+            if d > distance:
+                index, distance = i, d
+        if distance > tol:
+            keep[index] = True
+            stack.extend([(start, index), (index, end)])
+    return [p for p, k in zip(points, keep) if k]
+
+
+def _segment_distance(p, a, b):
+    (px, py), (ax, ay), (bx, by) = p, a, b
+    dx, dy = bx - ax, by - ay
+    if dx == dy == 0:
+        return math.hypot(px - ax, py - ay)
+    t = max(0.0, min(1.0, ((px - ax) * dx + (py - ay) * dy) / (dx * dx + dy * dy)))
+    return math.hypot(px - ax - t * dx, py - ay - t * dy)
+
+
+def _extent(ring):
+    xs, ys = zip(*ring)
+    return max(max(xs) - min(xs), max(ys) - min(ys))
+
+
+def to_geojson(countries, tol):
+    # Coordinates rounded one decimal place finer than the tolerance
+    digits = max(0, math.ceil(-math.log10(tol)) + 1)
+    features = []
+    for code, (name, polygons) in sorted(countries.items()):
+        rings = [
+            [[[round(x, digits), round(y, digits)] for x, y in ring + ring[:1]] for ring in polygon]
+            for polygon in polygons
+        ]
+        features.append(
+            {
+                "type": "Feature",
+                "id": code,
+                "properties": {"m49": code, "iso3": ISO3_CODES[name], "name": name},
+                "geometry": (
+                    {"type": "Polygon", "coordinates": rings[0]}
+                    if len(rings) == 1
+                    else {"type": "MultiPolygon", "coordinates": rings}
+                ),
+            }
+        )
+    return {"type": "FeatureCollection", "features": features}
+
+
+def build(source=WORLD_SOURCE_URL, out_dir=GEO_DIR):
+    """
+    Writes countries.z<zoom>.geojson for every ZOOM_LEVELS entry and returns
+    {zoom: (vertices, bytes)}.
+    """
+    countries = extract_countries(read_world(source))
+    os.makedirs(out_dir, exist_ok=True)
+    stats = {}
+    for zoom in ZOOM_LEVELS:
+        tol = tolerance(zoom)
+        collection = to_geojson(simplify_countries(countries, tol), tol)
+        data = json.dumps(collection, separators=(",", ":"))
+        path = os.path.join(out_dir, os.path.basename(variant_path(zoom)))
+        with open(f"{path}.tmp", "w") as f:
+            f.write(data)
+        os.replace(f"{path}.tmp", path)
+        vertices = sum(
+            len(ring)
+            for feature in collection["features"]
+            for polygon in _polygons(feature["geometry"])
+            for ring in polygon
+        )
+        stats[zoom] = (vertices, len(data))
+    return stats
+
+
+def _polygons(geometry):
+    if geometry["type"] == "Polygon":
+        return [geometry["coordinates"]]
+    return geometry["coordinates"]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--source", default=WORLD_SOURCE_URL)
+    parser.add_argument("--out", default=GEO_DIR)
+    args = parser.parse_args()
+
+    for zoom, (vertices, size) in build(args.source, args.out).items():
+        print(f"z{zoom}: {vertices} vertices, {size:,} bytes")
@@ -0,0 +1,154 @@
+import pandas as pd
+from utils_constants import CODE_TO_NAME, GEO_AREA_CODES
+
+INDICATOR_CODES = list(CODE_TO_NAME)
+
+# Columns the pipeline reads from a UN SDG export; everything else is skipped
+# at parse time. Sex/Location/Age are optional and only read when present.
+REQUIRED_COLUMNS = ["Indicator", "GeoAreaName", "TimePeriod", "Value"]
+DISAGGREGATION_COLUMNS = ["Sex", "Location", "Age"]
+
+# Value stays a string so non-numeric entries ("<2.5", "NaN") can be coerced
+# the same way for every chunk.
+RAW_DTYPES = {
+    "Indicator": str,
+    "GeoAreaName": str,
+    "TimePeriod": "int64",
+    "Value": str,
+    "Sex": str,
+    "Location": str,
+    "Age": str,
+}
+
+DEDUP_KEYS = ["GeoAreaCode", "TimePeriod", "IndicatorCode"]
+
+# Rows parsed per chunk; bounds peak memory independently of the file size.
+DEFAULT_CHUNKSIZE = 200_000
+
+
+def export_columns(file_path):
+    """
+    Returns the subset of pipeline columns present in the export's header.
+    """
+    header = list(pd.read_csv(file_path, nrows=0, compression="infer").columns)
+    missing = [c for c in REQUIRED_COLUMNS if c not in header]
+    if missing:
+        raise ValueError(f"SDG export is missing required columns: {missing}")
+    return REQUIRED_COLUMNS + [c for c in DISAGGREGATION_COLUMNS if c in header]
+
+
+def filter_raw(df):
+    """
+    Keeps aggregate rows for the tracked indicators and countries, keyed by
+    M49 GeoAreaCode and indicator code, with values coerced to numbers.
+    """
+    # 2. Filter for Aggregate Data (avoid double counting)
+    # Be more permissive: Keep if value matches target OR is missing/empty (implying total)
+
+    # Sex: Keep BOTHSEX or Null
+    if "Sex" in df.columns:
+        # Standardize for comparison
+        df["Sex"] = df["Sex"].fillna("Total").replace("", "Total")
+        # Keep rows that are explicitly BOTHSEX or interpreted as Total (missing)
+        # Exclude specific breakdowns like MALE/FEMALE if we can rely on BOTHSEX/Total
+        # Exception: Maternal Mortality (3.1.1) is FEMALE only.
+        df = df[df["Sex"].isin(["BOTHSEX", "Total", "FEMALE"])]
+
+    # Location: Keep ALLAREA or Null
+    if "Location" in df.columns:
+        df["Location"] = df["Location"].fillna("Total").replace("", "Total")
+        df = df[df["Location"].isin(["ALLAREA", "Total"])]
+
+    # Age: Keep ALLAGE or <5Y (for child metrics) or Null
+    if "Age" in df.columns:
+        df["Age"] = df["Age"].fillna("Total").replace("", "Total")
+        # Indicators like 2.1.2 use ALLAGE.
+        # Indicators like 3.2.1/2.2.1 use <5Y.
+        # We accept both as valid "aggregates" for their respective indicators.
+        df = df[df["Age"].isin(["ALLAGE", "<5Y", "Total"])]
+
+    # 3. Key rows by compact codes; display names are resolved in finalize
+    # Indicator: raw code ("2.1.1") as a categorical over the tracked codes
+    # Country: M49 code looked up from the name (the export's own GeoAreaCode
+    # column is not reliable in hand-made extracts)
+
+    # 4. Filter Indicators
+    # Ensure string types and strip whitespace
+    df["Indicator"] = df["Indicator"].astype(str).str.strip()
+    df = df[df["Indicator"].isin(INDICATOR_CODES)]
+    df["IndicatorCode"] = pd.Categorical(df["Indicator"], categories=INDICATOR_CODES)
+
+    # 5. Clean Value Column
+    df["Value"] = pd.to_numeric(df["Value"], errors="coerce")
+
+    # 6. Filter Target Countries
+    geo_codes = df["GeoAreaName"].astype(str).str.strip().map(GEO_AREA_CODES)
+    df = df[geo_codes.notna()]
+    df["GeoAreaCode"] = geo_codes[geo_codes.notna()].astype("int16")
+
+    return df[DEDUP_KEYS + ["Value"]]
+
+
+def partial_sums(df):
+    """
+    Per-key (sum, count) of a filtered chunk, indexed by DEDUP_KEYS.
+    """
+    grouped = df.groupby(DEDUP_KEYS, observed=True)["Value"]
+    return pd.DataFrame({"sum": grouped.sum(), "count": grouped.count()})
+
+
+def combine_partials(totals, partial):
+    """
+    Folds one chunk's partial sums into the running totals. Each key's total
+    only depends on the sequence of its own partials, so any partitioning of
+    the keys that keeps chunk order gives bit-identical results.
+    """
+    if totals is None:
+        return partial
+    if partial.empty:
+        return totals
+    return pd.concat([totals, partial]).groupby(level=DEDUP_KEYS, observed=True).sum()
+
+
+def finish_means(totals):
+    """
+    Turns running totals into the deduplicated long frame.
+    """
+    if totals is None or totals.empty:
+        return pd.DataFrame(columns=DEDUP_KEYS + ["Value"])
+
+    # 7. Deduplicate: mean of every value seen for a country-year-indicator
+    mean = totals["sum"] / totals["count"].where(totals["count"] > 0)
+    return mean.rename("Value").reset_index()
+
+
+def iter_partials(file_path, chunksize=DEFAULT_CHUNKSIZE):
+    """
+    Streams the export and yields partial_sums for each filtered chunk.
+    """
+    columns = export_columns(file_path)
+    reader = pd.read_csv(
+        file_path,
+        usecols=columns,
+        dtype={c: RAW_DTYPES[c] for c in columns},
+        compression="infer",
+        chunksize=chunksize,
+    )
+    with reader:
+        for chunk in reader:
+            yield partial_sums(filter_raw(chunk))
+
+
+def read_sdg_export(file_path, chunksize=DEFAULT_CHUNKSIZE):
+    """
+    Streams a UN SDG export (.csv, optionally .gz/.zip/.zst/.bz2/.xz compressed)
+    and returns the deduplicated (GeoAreaCode, TimePeriod, IndicatorCode, Value) frame.
+
+    Only the pipeline columns are parsed, filters are applied chunk by chunk and
+    duplicates are folded into running sums/counts, so peak memory is bounded by
+    the chunk size plus the (small) filtered result.
+    """
+    totals = None
+    for partial in iter_partials(file_path, chunksize):
+        totals = combine_partials(totals, partial)
+    return finish_means(totals)
@@ -0,0 +1,72 @@
+import numpy as np
+
+METHODS = ("linear", "nearest", "previous", "next")
+EDGES = ("hold", "none")
+
+
+def fill_gaps(values, method="linear", edge="hold"):
+    """
+    Fills NaN gaps along the last (year) axis of a dense array in one pass.
+
+    `values` can have any leading shape, e.g. (country, indicator, year).
+    Methods:
+      - linear:   straight line between the surrounding observations
+      - nearest:  closest observation (ties go to the earlier year)
+      - previous: last observation carried forward
+      - next:     next observation carried backward
+    With edge="hold" the first/last observation is held constant before/after
+    the observed span (pandas' limit_direction="both"); edge="none" leaves it NaN.
+    Series with no observations stay all-NaN.
+    """
+    if method not in METHODS:
+        raise ValueError(f"Unknown interpolation method '{method}'. Use one of {METHODS}.")
+    if edge not in EDGES:
+        raise ValueError(f"Unknown edge mode '{edge}'. Use one of {EDGES}.")
+
+    values = np.asarray(values, dtype="float64")
+    shape = values.shape
+    n_years = shape[-1]
+    series = values.reshape(-1, n_years)
+
+    valid = ~np.isnan(series)
+    positions = np.arange(n_years)
+
+    # Index of the closest observation at or before / at or after each cell
+    prev_idx = np.maximum.accumulate(np.where(valid, positions, -1), axis=1)
+    next_idx = np.minimum.accumulate(
+        np.where(valid, positions, n_years)[:, ::-1], axis=1
+    )[:, ::-1]
+    has_prev = prev_idx >= 0
+    has_next = next_idx < n_years
+
+    prev_val = np.take_along_axis(series, np.clip(prev_idx, 0, n_years - 1), axis=1)
+    next_val = np.take_along_axis(series, np.clip(next_idx, 0, n_years - 1), axis=1)
+
+    if method == "linear":
+        # Same formula as np.interp, which pandas uses, so results match bit for bit
+        with np.errstate(divide="ignore", invalid="ignore"):
+            slope = (next_val - prev_val) / (next_idx - prev_idx)
+            inner = slope * (positions - prev_idx) + prev_val
+    elif method == "nearest":
+        inner = np.where(next_idx - positions < positions - prev_idx, next_val, prev_val)
+    elif method == "previous":
+        inner = prev_val
+    else:
+        inner = next_val
+
+    out = np.where(valid, series, np.nan)
+    gaps = ~valid & has_prev & has_next
+    out[gaps] = inner[gaps]
+
+    if method == "previous":
+        out[~valid & has_prev & ~has_next] = prev_val[~valid & has_prev & ~has_next]
+    elif method == "next":
+        out[~valid & ~has_prev & has_next] = next_val[~valid & ~has_prev & has_next]
+
+    if edge == "hold":
+        leading = ~valid & ~has_prev & has_next
+        trailing = ~valid & has_prev & ~has_next
+        out[leading] = next_val[leading]
+        out[trailing] = prev_val[trailing]
+
+    return out.reshape(shape)
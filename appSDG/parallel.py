@@ -0,0 +1,308 @@
+"""
+Process-pool version of the preprocessing pipeline (steps 2-8).
+
+The parent only scans the export for the byte ranges of the chunks the serial
+path streams (chunk_ranges). Workers parse, filter and sum contiguous runs of
+those chunks and split every chunk's partial sums by country (or indicator).
+Each worker then folds one partition's partials in chunk order, takes the
+means and interpolates its block of series; the parent stitches the blocks
+back onto the sorted axes. Keys never span partitions and each key sees the
+same partials in the same order as the serial path, so the result is
+identical bit for bit, whatever the worker count.
+
+Compressed exports cannot be split by byte range; for those the parent
+streams the export itself (split_partials) and only the fold is parallel.
+
+Workers only import this module, ingest, interpolation, timing and
+utils_constants (no Streamlit).
+"""
+import io
+import mmap
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+from pandas.io.common import infer_compression
+
+from ingest import (
+    DEDUP_KEYS,
+    DEFAULT_CHUNKSIZE,
+    INDICATOR_CODES,
+    RAW_DTYPES,
+    combine_partials,
+    export_columns,
+    filter_raw,
+    finish_means,
+    iter_partials,
+    partial_sums,
+)
+from interpolation import fill_gaps
+from timing import span
+from utils_constants import GEO_AREA_CODES
+
+PARTITION_KEYS = {"country": "GeoAreaCode", "indicator": "IndicatorCode"}
+YEARS = range(2015, 2025)
+
+# Bytes scanned per step by chunk_ranges
+SCAN_BLOCK = 1 << 24
+
+
+def pipeline_workers():
+    """
+    Worker count for full rebuilds, from SDG_PIPELINE_WORKERS (default 1 = serial).
+    """
+    try:
+        return max(1, int(os.environ.get("SDG_PIPELINE_WORKERS", "1")))
+    except ValueError:
+        return 1
+
+
+def _indicator_order(codes):
+    # Category order of IndicatorCode, which is what the serial factorize sorts by
+    rank = {code: i for i, code in enumerate(INDICATOR_CODES)}
+    return sorted(codes, key=rank.__getitem__)
+
+
+def _process_partition(partials, geo_axis, indicator_axis, years):
+    """
+    Worker: dedup + dense packing + interpolation for one partition.
+    Returns (deduped, raw, filled) with raw/filled shaped
+    (len(geo_axis), len(indicator_axis), len(years)).
+    """
+    totals = None
+    for partial in partials:
+        totals = combine_partials(totals, partial)
+    deduped = finish_means(totals)
+
+    years = np.asarray(years)
+    geo_pos = np.searchsorted(geo_axis, deduped["GeoAreaCode"].to_numpy())
+    ind_rank = {code: i for i, code in enumerate(indicator_axis)}
+    ind_pos = np.array([ind_rank[c] for c in deduped["IndicatorCode"]], dtype="int64")
+    year_pos = np.asarray(deduped["TimePeriod"].to_numpy() - years[0], dtype="int64")
+    in_window = (year_pos >= 0) & (year_pos < len(years))
+
+    raw = np.full((len(geo_axis), len(indicator_axis), len(years)), np.nan)
+    raw[geo_pos[in_window], ind_pos[in_window], year_pos[in_window]] = deduped[
+        "Value"
+    ].to_numpy(dtype="float64")[in_window]
+    return deduped, raw, fill_gaps(raw)
+
+
+def _split_partial(partial, n_parts, by):
+    """
+    One chunk's partial sums as a list with one frame (or None) per partition.
+    Countries and indicators are dealt out round-robin in code order (every
+    tracked M49 code is even, so code % n_parts would leave partitions empty).
+    """
+    parts = [None] * n_parts
+    if partial.empty:
+        return parts
+    codes = sorted(set(GEO_AREA_CODES.values())) if by == "country" else INDICATOR_CODES
+    slot = {code: i % n_parts for i, code in enumerate(codes)}
+    values = partial.index.get_level_values(PARTITION_KEYS[by])
+    part_ids = np.array([slot[c] for c in values], dtype="int64")
+    for part_id in np.unique(part_ids):
+        parts[part_id] = partial[part_ids == part_id]
+    return parts
+
+
+def _bucket(split_chunks, n_parts):
+    # Per partition, the non-empty partials in chunk order
+    buckets = [[] for _ in range(n_parts)]
+    for parts in split_chunks:
+        for bucket, part in zip(buckets, parts):
+            if part is not None:
+                bucket.append(part)
+    return buckets
+
+
+def split_partials(file_path, n_parts, by="country", chunksize=DEFAULT_CHUNKSIZE):
+    """
+    Streams the export in this process and returns one list of chunk partials
+    per partition, each list in chunk order.
+    """
+    return _bucket(
+        (_split_partial(partial, n_parts, by) for partial in iter_partials(file_path, chunksize)),
+        n_parts,
+    )
+
+
+def chunk_ranges(file_path, chunksize=DEFAULT_CHUNKSIZE):
+    """
+    (start, end, rows) byte ranges of the chunks iter_partials reads: `rows`
+    data rows each, `chunksize` for all but the last. Rows end at newlines
+    outside quoted fields and blank lines are skipped, as read_csv does.
+    Returns None for compressed exports, which cannot be split.
+    """
+    if infer_compression(file_path, "infer") is not None:
+        return None
+    with open(file_path, "rb") as f:
+        if not os.fstat(f.fileno()).st_size:
+            return []
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            return _scan_rows(mm, chunksize)
+
+
+def _scan_rows(buf, chunksize):
+    data = np.frombuffer(buf, dtype=np.uint8)
+    size = len(data)
+    boundaries = []  # offsets just past the last row of every full chunk
+    header_end = None
+    rows = 0  # data rows before the current block
+    quoted = 0  # quote parity at the start of the block
+    line_start = 0  # offset of the line the block starts in
+    for offset in range(0, size, SCAN_BLOCK):
+        block = data[offset : offset + SCAN_BLOCK]
+        quotes = np.flatnonzero(block == ord('"'))
+        newlines = np.flatnonzero(block == ord("\n"))
+        ends = newlines[(quoted + np.searchsorted(quotes, newlines)) % 2 == 0] + offset
+        quoted = (quoted + len(quotes)) % 2
+        if not len(ends):
+            continue
+
+        starts = np.concatenate(([line_start], ends[:-1] + 1))
+        line_start = int(ends[-1]) + 1
+        lengths = ends - starts
+        # Blank lines ("" or a lone CR) are not rows
+        lone = lengths == 1
+        lone[lone] = data[starts[lone]] == ord("\r")
+        ends = ends[(lengths > 0) & ~lone]
+        if header_end is None and len(ends):
+            header_end, ends = int(ends[0]) + 1, ends[1:]
+        last = (rows + np.arange(1, len(ends) + 1)) % chunksize == 0
+        boundaries.extend((ends[last] + 1).tolist())
+        rows += len(ends)
+
+    if header_end is None:
+        return []
+    if bytes(buf[line_start:]).strip(b"\r\n"):
+        rows += 1  # last row without a trailing newline
+    if rows > chunksize * len(boundaries):
+        boundaries.append(size)
+    starts = [header_end] + boundaries[:-1]
+    counts = [chunksize] * (len(boundaries) - 1) + [rows - chunksize * (len(boundaries) - 1)]
+    return [r for r in zip(starts, boundaries, counts) if r[2]]
+
+
+def _chunk_partials(file_path, names, columns, ranges, n_parts, by):
+    """
+    Worker: parses, filters and sums the chunks at `ranges` (from chunk_ranges)
+    and returns each chunk's partials split into `n_parts` partitions.
+    """
+    dtype = {c: RAW_DTYPES[c] for c in columns}
+    split = []
+    with open(file_path, "rb") as f:
+        for start, end, rows in ranges:
+            f.seek(start)
+            chunk = pd.read_csv(
+                io.BytesIO(f.read(end - start)),
+                header=None,
+                names=names,
+                usecols=columns,
+                dtype=dtype,
+            )
+            if len(chunk) != rows:
+                raise ValueError(f"Chunk at byte {start} has {len(chunk)} rows, expected {rows}")
+            split.append(_split_partial(partial_sums(filter_raw(chunk)), n_parts, by))
+    return split
+
+
+def _worker_partials(pool, file_path, workers, by, chunksize):
+    """
+    Per partition, the chunk partials in chunk order, computed by the pool from
+    contiguous runs of chunks. None when the export cannot be split by byte
+    range or the scan disagrees with read_csv (the caller then streams it).
+    """
+    with span("load.parallel.scan"):
+        ranges = chunk_ranges(file_path, chunksize)
+    if not ranges:
+        return None
+    names = list(pd.read_csv(file_path, nrows=0).columns)
+    columns = export_columns(file_path)
+    runs = [list(run) for run in np.array_split(np.arange(len(ranges)), min(workers, len(ranges)))]
+    try:
+        results = pool.map(
+            _chunk_partials,
+            [file_path] * len(runs),
+            [names] * len(runs),
+            [columns] * len(runs),
+            [[ranges[i] for i in run] for run in runs],
+            [workers] * len(runs),
+            [by] * len(runs),
+        )
+        return _bucket((parts for result in results for parts in result), workers)
+    except ValueError:
+        return None
+
+
+def run_parallel(
+    file_path, workers, by="country", years=YEARS, chunksize=DEFAULT_CHUNKSIZE
+):
+    """
+    Runs steps 2-8 on `workers` processes and returns
+    (deduped, geo_codes, indicator_codes, raw, filled): the same deduplicated
+    frame as read_sdg_export and the dense arrays on sorted code axes, exactly
+    as to_dense + fill_gaps would produce them.
+    """
+    if by not in PARTITION_KEYS:
+        raise ValueError(f"Unknown partition key '{by}'. Use one of {tuple(PARTITION_KEYS)}.")
+
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context) as pool:
+        with span("load.parallel.partials"):
+            buckets = _worker_partials(pool, file_path, workers, by, chunksize)
+            if buckets is None:
+                buckets = split_partials(file_path, workers, by, chunksize)
+        buckets = [b for b in buckets if b]
+        if not buckets:
+            empty = np.full((0, 0, len(years)), np.nan)
+            return finish_means(None), np.array([], dtype="int16"), np.array([], dtype=object), empty, empty
+
+        def axis(parts, level):
+            codes = set()
+            for p in parts:
+                codes.update(p.index.unique(level))
+            return codes
+
+        all_partials = [p for b in buckets for p in b]
+        if by == "country":
+            geo_axes = [np.array(sorted(axis(b, "GeoAreaCode")), dtype="int16") for b in buckets]
+            ind_axes = [_indicator_order(axis(all_partials, "IndicatorCode"))] * len(buckets)
+        else:
+            geo_axes = [np.array(sorted(axis(all_partials, "GeoAreaCode")), dtype="int16")] * len(buckets)
+            ind_axes = [_indicator_order(axis(b, "IndicatorCode")) for b in buckets]
+
+        with span("load.parallel.partitions"):
+            results = list(
+                pool.map(
+                    _process_partition,
+                    buckets,
+                    geo_axes,
+                    ind_axes,
+                    [list(years)] * len(buckets),
+                )
+            )
+
+    deduped = (
+        pd.concat([r[0] for r in results], ignore_index=True)
+        .sort_values(DEDUP_KEYS, kind="stable", ignore_index=True)
+    )
+    stack_axis = 0 if by == "country" else 1
+    raw = np.concatenate([r[1] for r in results], axis=stack_axis)
+    filled = np.concatenate([r[2] for r in results], axis=stack_axis)
+
+    if by == "country":
+        geo_codes = np.concatenate(geo_axes)
+        order = np.argsort(geo_codes, kind="stable")
+        geo_codes, raw, filled = geo_codes[order], raw[order], filled[order]
+        indicator_codes = np.array(ind_axes[0], dtype=object)
+    else:
+        geo_codes = geo_axes[0]
+        labels = [c for axis_codes in ind_axes for c in axis_codes]
+        order = np.array([labels.index(c) for c in _indicator_order(labels)], dtype="int64")
+        indicator_codes = np.array(labels, dtype=object)[order]
+        raw, filled = raw[:, order], filled[:, order]
+
+    return deduped, geo_codes, indicator_codes, raw, filled
@@ -0,0 +1,106 @@
+import hashlib
+from collections import namedtuple
+
+from timing import timed
+
+# Radar axes are grouped by goal in this order
+SDG_ORDER = ["SDG 2", "SDG 3", "SDG 6"]
+FOCUS_COUNTRY = "India"
+
+# Regions whose countries set the scaling (and get an average trace) per sidebar choice
+REGION_CONTEXTS = {
+    "All": ("South Asia", "South East Asia"),
+    "South Asia": ("South Asia",),
+    "South East Asia": ("South East Asia",),
+}
+
+# Normalized radar values for one (year, region context):
+#   categories: indicators present that year, in radar order
+#   countries:  country -> normalized values (0-1, missing as 0)
+#   averages:   region  -> normalized regional average
+#   scaled:     countries whose values set the min/max scaling
+RadarView = namedtuple("RadarView", ["categories", "countries", "averages", "scaled"])
+
+
+def radar_indicators(sdg_map):
+    indicators = []
+    for sdg in SDG_ORDER:
+        if sdg in sdg_map:
+            indicators.extend(sdg_map[sdg])
+    return indicators
+
+
+def column_means(table):
+    # Grouped mean (same summation as pivot_table's aggfunc="mean")
+    return table.stack().groupby(level="Indicator").mean()
+
+
+class RadarTables:
+    """
+    Radar chart inputs precomputed for every (year, region context): the
+    context-aware min/max scaling, regional averages and every country's
+    normalized values, so a rerun only picks rows.
+    """
+
+    def __init__(self, cube, sdg_map):
+        self.cube = cube
+        self.indicators = radar_indicators(sdg_map)
+        self.digest = hashlib.blake2b(
+            (cube.digest + repr(self.indicators)).encode(), digest_size=16
+        ).hexdigest()
+
+        self._views = {}
+        for year in cube.years.tolist():
+            table = cube.cross_section(self.indicators, year)
+            for context, regions in REGION_CONTEXTS.items():
+                self._views[(year, context)] = self._build(table, regions, set())
+
+    @timed("radar.view")
+    def view(self, year, region, selected_countries=()):
+        """
+        Returns the RadarView for `year` and the sidebar region, or None when
+        there is no data that year. Countries selected outside the precomputed
+        context widen the scaling, so that view is built on demand.
+        """
+        regions = REGION_CONTEXTS.get(region, ())
+        view = self._views.get((year, region))
+        if view is not None and set(selected_countries) <= view.scaled:
+            return view
+
+        table = self.cube.cross_section(self.indicators, year)
+        return self._build(table, regions, set(selected_countries))
+
+    def _build(self, table, regions, extra_countries):
+        if table.empty:
+            return None
+
+        # --- Context-aware normalization ---
+        scaled = {FOCUS_COUNTRY} | extra_countries
+        for region in regions:
+            scaled.update(self.cube.countries_in_region(region))
+
+        scaling = table[table.index.isin(scaled)]
+        if scaling.empty:
+            scaling = table
+
+        local_min = scaling.min()
+        diff = scaling.max() - local_min
+        diff[diff == 0] = 1
+
+        categories = [c for c in self.indicators if c in table.columns]
+        local_min = local_min.reindex(categories)
+        diff = diff.reindex(categories)
+
+        def normalize(series):
+            return ((series.reindex(categories) - local_min) / diff).fillna(0).tolist()
+
+        normalized = ((table.reindex(columns=categories) - local_min) / diff).fillna(0)
+        countries = dict(zip(normalized.index, normalized.to_numpy().tolist()))
+
+        averages = {}
+        for region in regions:
+            members = table[table.index.isin(self.cube.countries_in_region(region))]
+            if not members.empty:
+                averages[region] = normalize(column_means(members))
+
+        return RadarView(categories, countries, averages, frozenset(scaled))
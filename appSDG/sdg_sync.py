@@ -0,0 +1,358 @@
+"""
+Bulk sync of the configured SDG series from the UN SDG API into the local
+mirror that load_data reads (mirror/SDG_final.csv).
+
+Usage (from the appSDG folder):
+    python sdg_sync.py [--base-url https://unstats.un.org/sdgapi] [--concurrency 8]
+
+Pages are fetched concurrently through a bounded pool of keep-alive
+connections. The first page of every series is requested with the ETag /
+Last-Modified validators from the previous run; a 304 skips the series.
+"""
+import argparse
+import asyncio
+import csv
+import http.client
+import json
+import os
+import queue
+import threading
+import time
+import urllib.parse
+from concurrent.futures import ThreadPoolExecutor
+
+from utils_constants import GEO_AREA_CODES, SERIES_CODES
+
+DEFAULT_BASE_URL = "https://unstats.un.org/sdgapi"
+DATA_ENDPOINT = "/v1/sdg/Series/Data"
+DEFAULT_CONCURRENCY = 8
+DEFAULT_PAGE_SIZE = 1000
+
+MIRROR_DIR = os.path.join(os.path.dirname(__file__), "mirror")
+MIRROR_FILE = "SDG_final.csv"
+STATE_FILE = "sync_state.json"
+
+# Column layout of SDG_final.csv (UN SDG Global Database export)
+CSV_COLUMNS = [
+    "Goal",
+    "Target",
+    "Indicator",
+    "SeriesCode",
+    "SeriesDescription",
+    "GeoAreaCode",
+    "GeoAreaName",
+    "TimePeriod",
+    "Value",
+    "Time_Detail",
+    "UpperBound",
+    "LowerBound",
+    "Source",
+    "FootNote",
+    "Age",
+    "Location",
+    "Nature",
+    "Observation Status",
+    "Reporting Type",
+    "Sex",
+    "Units",
+]
+DIMENSION_COLUMNS = ["Age", "Location", "Reporting Type", "Sex"]
+ATTRIBUTE_COLUMNS = ["Nature", "Observation Status", "Units"]
+
+
+class ConnectionPool:
+    """
+    At most `size` persistent HTTP(S) connections to one host, shared by the
+    worker threads that run the blocking requests.
+    """
+
+    def __init__(self, base_url, size=DEFAULT_CONCURRENCY, timeout=60):
+        parts = urllib.parse.urlsplit(base_url)
+        self._conn_cls = (
+            http.client.HTTPSConnection
+            if parts.scheme == "https"
+            else http.client.HTTPConnection
+        )
+        self._host = parts.hostname
+        self._port = parts.port
+        self._timeout = timeout
+        self.path_prefix = parts.path.rstrip("/")
+        self._idle = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(size)
+
+    def _connect(self):
+        return self._conn_cls(self._host, self._port, timeout=self._timeout)
+
+    def request(self, path, headers=None):
+        """
+        GETs path and returns (status, headers, body). Retries once on a fresh
+        connection if a kept-alive one was closed by the server.
+        """
+        with self._slots:
+            try:
+                conn = self._idle.get_nowait()
+            except queue.Empty:
+                conn = self._connect()
+
+            for attempt in range(2):
+                try:
+                    conn.request("GET", self.path_prefix + path, headers=headers or {})
+                    resp = conn.getresponse()
+                    body = resp.read()
+                    break
+                except (http.client.HTTPException, OSError):
+                    conn.close()
+                    if attempt:
+                        raise
+                    conn = self._connect()
+
+            if resp.will_close:
+                conn.close()
+            else:
+                self._idle.put(conn)
+            return resp.status, dict(resp.getheaders()), body
+
+    def close(self):
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                return
+
+
+class SyncStats:
+    def __init__(self):
+        self.requests = 0
+        self.not_modified = 0
+        self.bytes = 0
+        self.rows = 0
+        self.series_updated = 0
+        self.elapsed = 0.0
+
+    def report(self):
+        elapsed = self.elapsed or float("nan")
+        return (
+            f"{self.requests} requests ({self.not_modified} not modified), "
+            f"{self.series_updated} series updated, {self.rows:,} rows, "
+            f"{self.bytes / 1e6:.2f} MB in {self.elapsed:.2f}s "
+            f"-> {self.requests / elapsed:.1f} req/s, "
+            f"{self.rows / elapsed:,.0f} rows/s, {self.bytes / 1e6 / elapsed:.2f} MB/s"
+        )
+
+
+def record_to_row(record):
+    """
+    Flattens one API data record into the SDG_final.csv column layout.
+    """
+    dimensions = record.get("dimensions") or {}
+    attributes = record.get("attributes") or {}
+    footnotes = record.get("footnotes") or []
+    time_period = record.get("timePeriodStart")
+
+    row = {
+        "Goal": (record.get("goal") or [""])[0],
+        "Target": (record.get("target") or [""])[0],
+        "Indicator": (record.get("indicator") or [""])[0],
+        "SeriesCode": record.get("series"),
+        "SeriesDescription": record.get("seriesDescription"),
+        "GeoAreaCode": record.get("geoAreaCode"),
+        "GeoAreaName": record.get("geoAreaName"),
+        "TimePeriod": int(time_period) if time_period is not None else None,
+        "Value": record.get("value"),
+        "Time_Detail": record.get("time_detail"),
+        "UpperBound": record.get("upperBound"),
+        "LowerBound": record.get("lowerBound"),
+        "Source": record.get("source"),
+        "FootNote": "; ".join(footnotes) if isinstance(footnotes, list) else footnotes,
+    }
+    row.update({c: dimensions.get(c) for c in DIMENSION_COLUMNS})
+    row.update({c: attributes.get(c) for c in ATTRIBUTE_COLUMNS})
+    return row
+
+
+class SDGSyncClient:
+    def __init__(
+        self,
+        base_url=DEFAULT_BASE_URL,
+        concurrency=DEFAULT_CONCURRENCY,
+        page_size=DEFAULT_PAGE_SIZE,
+        timeout=60,
+    ):
+        self.pool = ConnectionPool(base_url, concurrency, timeout)
+        self.page_size = page_size
+        self.stats = SyncStats()
+        self._executor = ThreadPoolExecutor(max_workers=concurrency)
+
+    def close(self):
+        self._executor.shutdown(wait=True)
+        self.pool.close()
+
+    async def _get(self, params, headers=None):
+        path = f"{DATA_ENDPOINT}?{urllib.parse.urlencode(params, doseq=True)}"
+        loop = asyncio.get_running_loop()
+        status, resp_headers, body = await loop.run_in_executor(
+            self._executor, self.pool.request, path, headers
+        )
+        self.stats.requests += 1
+        self.stats.bytes += len(body)
+        if status == 304:
+            self.stats.not_modified += 1
+        elif status != 200:
+            raise RuntimeError(f"{path} returned HTTP {status}")
+        return status, resp_headers, body
+
+    async def fetch_series(self, series_code, area_codes, validators=None):
+        """
+        Returns (rows, validators) for one series, or None if the server says
+        it has not changed since `validators` were issued.
+        """
+        params = {"seriesCode": series_code, "areaCode": list(area_codes), "pageSize": self.page_size}
+        headers = {"Accept": "application/json"}
+        if validators:
+            if validators.get("etag"):
+                headers["If-None-Match"] = validators["etag"]
+            if validators.get("last_modified"):
+                headers["If-Modified-Since"] = validators["last_modified"]
+
+        status, resp_headers, body = await self._get({**params, "page": 1}, headers)
+        if status == 304:
+            return None
+
+        first = json.loads(body)
+        pages = [first]
+        total_pages = int(first.get("totalPages") or 1)
+        if total_pages > 1:
+            rest = await asyncio.gather(
+                *(self._get({**params, "page": p}) for p in range(2, total_pages + 1))
+            )
+            pages.extend(json.loads(r[2]) for r in rest)
+
+        rows = [record_to_row(rec) for page in pages for rec in page.get("data", [])]
+        lower = {k.lower(): v for k, v in resp_headers.items()}
+        return rows, {"etag": lower.get("etag"), "last_modified": lower.get("last-modified")}
+
+    async def sync(self, series_codes, area_codes, mirror_dir=MIRROR_DIR):
+        """
+        Fetches every series concurrently, rewrites the per-series CSVs that
+        changed and rebuilds the mirror file. Returns the SyncStats.
+        """
+        start = time.perf_counter()
+        area_codes = sorted(str(c) for c in area_codes)
+        state_path = os.path.join(mirror_dir, STATE_FILE)
+        state = _read_json(state_path)
+        if state.get("area_codes") != area_codes:
+            state = {"area_codes": area_codes, "series": {}}
+
+        # Validators are only sent for series whose CSV is still on disk: a 304
+        # for a missing file would leave that series out of the rebuilt mirror
+        series_dir = os.path.join(mirror_dir, "series")
+        results = await asyncio.gather(
+            *(
+                self.fetch_series(
+                    code,
+                    area_codes,
+                    state["series"].get(code)
+                    if os.path.exists(os.path.join(series_dir, f"{code}.csv"))
+                    else None,
+                )
+                for code in series_codes
+            )
+        )
+
+        os.makedirs(series_dir, exist_ok=True)
+        for code, result in zip(series_codes, results):
+            if result is None:
+                continue
+            rows, validators = result
+            _write_csv(os.path.join(series_dir, f"{code}.csv"), rows)
+            state["series"][code] = {**validators, "rows": len(rows)}
+            self.stats.series_updated += 1
+            self.stats.rows += len(rows)
+
+        mirror_path = os.path.join(mirror_dir, MIRROR_FILE)
+        if self.stats.series_updated or not os.path.exists(mirror_path):
+            _combine(
+                [os.path.join(series_dir, f"{code}.csv") for code in series_codes],
+                mirror_path,
+            )
+        _write_json(state_path, state)
+
+        self.stats.elapsed = time.perf_counter() - start
+        return self.stats
+
+
+def _read_json(path):
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _write_json(path, data):
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(data, f, indent=2)
+    os.replace(tmp_path, path)
+
+
+def _write_csv(path, rows):
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=CSV_COLUMNS)
+        writer.writeheader()
+        writer.writerows(rows)
+    os.replace(tmp_path, path)
+
+
+def _combine(series_paths, mirror_path):
+    # Written to a temp file and swapped in, so the loader never sees a partial file
+    tmp_path = f"{mirror_path}.tmp"
+    with open(tmp_path, "w", newline="", encoding="utf-8") as out:
+        out.write(",".join(CSV_COLUMNS) + "\n")
+        for path in series_paths:
+            if not os.path.exists(path):
+                continue
+            with open(path, encoding="utf-8") as f:
+                next(f, None)
+                for line in f:
+                    out.write(line)
+    os.replace(tmp_path, mirror_path)
+
+
+def run_sync(
+    base_url=DEFAULT_BASE_URL,
+    series_codes=None,
+    area_codes=None,
+    mirror_dir=MIRROR_DIR,
+    concurrency=DEFAULT_CONCURRENCY,
+    page_size=DEFAULT_PAGE_SIZE,
+):
+    client = SDGSyncClient(base_url, concurrency, page_size)
+    try:
+        return asyncio.run(
+            client.sync(
+                series_codes or list(SERIES_CODES.values()),
+                area_codes or list(GEO_AREA_CODES.values()),
+                mirror_dir,
+            )
+        )
+    finally:
+        client.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--base-url", default=DEFAULT_BASE_URL)
+    parser.add_argument("--mirror", default=MIRROR_DIR)
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY)
+    parser.add_argument("--page-size", type=int, default=DEFAULT_PAGE_SIZE)
+    args = parser.parse_args()
+
+    stats = run_sync(
+        args.base_url,
+        mirror_dir=args.mirror,
+        concurrency=args.concurrency,
+        page_size=args.page_size,
+    )
+    print(stats.report())
@@ -0,0 +1,234 @@
+"""
+Per-process timing histograms for the dashboard's hot paths.
+
+span(name) times a block and timed(name) a function. Observations are folded
+into one fixed-bucket histogram per span name, shared by every session of the
+process. Recording is off until enable() is called (main.py does so for
+`?debug=1`) or SDG_TIMINGS=1 / SDG_METRICS_PORT is set; while off, a span is
+one flag check and a shared no-op context manager.
+
+The histograms are shown in the sidebar debug panel and exported in the
+Prometheus text format (prometheus_text), over HTTP on 127.0.0.1 when
+SDG_METRICS_PORT is set (see serve_metrics).
+
+No Streamlit imports, so pipeline workers and benchmarks can use it too.
+"""
+import bisect
+import functools
+import logging
+import os
+import threading
+import time
+from contextlib import nullcontext
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Upper bounds of the histogram buckets, in seconds (plus an implicit +Inf)
+BUCKETS = (
+    0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05,
+    0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0,
+)
+
+METRIC_NAME = "sdg_span_seconds"
+
+_LOGGER = logging.getLogger(__name__)
+
+_NO_SPAN = nullcontext()
+
+_enabled = os.environ.get("SDG_TIMINGS", "").strip() not in ("", "0") or bool(
+    os.environ.get("SDG_METRICS_PORT", "").strip()
+)
+
+
+def enable():
+    """Starts recording spans in this process (until the process exits)."""
+    global _enabled
+    _enabled = True
+
+
+def enabled():
+    return _enabled
+
+
+class Histogram:
+    """Bucketed durations of one span: counts per BUCKETS bound, sum and count."""
+
+    __slots__ = ("counts", "sum", "count", "max")
+
+    def __init__(self):
+        self.counts = [0] * (len(BUCKETS) + 1)
+        self.sum = 0.0
+        self.count = 0
+        self.max = 0.0
+
+    def observe(self, seconds):
+        self.counts[bisect.bisect_left(BUCKETS, seconds)] += 1
+        self.sum += seconds
+        self.count += 1
+        self.max = max(self.max, seconds)
+
+    def quantile(self, q):
+        """
+        Estimated q-quantile in seconds, interpolated linearly within its
+        bucket (as Prometheus' histogram_quantile); capped at the maximum seen.
+        """
+        if not self.count:
+            return float("nan")
+        rank = q * self.count
+        seen = 0
+        for i, n in enumerate(self.counts):
+            if n and seen + n >= rank:
+                low = BUCKETS[i - 1] if i else 0.0
+                high = BUCKETS[i] if i < len(BUCKETS) else self.max
+                return min(low + (high - low) * (rank - seen) / n, self.max)
+            seen += n
+        return self.max
+
+
+class Timings:
+    """Thread-safe registry of span histograms, keyed by span name."""
+
+    def __init__(self):
+        self._histograms = {}
+        self._lock = threading.Lock()
+
+    def observe(self, name, seconds):
+        with self._lock:
+            histogram = self._histograms.get(name)
+            if histogram is None:
+                histogram = self._histograms[name] = Histogram()
+            histogram.observe(seconds)
+
+    def reset(self):
+        with self._lock:
+            self._histograms = {}
+
+    def summary(self):
+        """
+        One dict per span, in name order: count, mean, p50, p95, max and
+        total, in milliseconds.
+        """
+        with self._lock:
+            histograms = sorted(self._histograms.items())
+            return [
+                {
+                    "span": name,
+                    "count": h.count,
+                    "mean_ms": h.sum / h.count * 1000,
+                    "p50_ms": h.quantile(0.5) * 1000,
+                    "p95_ms": h.quantile(0.95) * 1000,
+                    "max_ms": h.max * 1000,
+                    "total_ms": h.sum * 1000,
+                }
+                for name, h in histograms
+            ]
+
+    def prometheus_text(self):
+        """The histograms in the Prometheus text exposition format (0.0.4)."""
+        lines = [
+            f"# HELP {METRIC_NAME} Duration of instrumented dashboard code paths.",
+            f"# TYPE {METRIC_NAME} histogram",
+        ]
+        with self._lock:
+            for name, h in sorted(self._histograms.items()):
+                label = name.replace("\\", "\\\\").replace('"', '\\"')
+                cumulative = 0
+                for bound, n in zip(BUCKETS + ("+Inf",), h.counts):
+                    cumulative += n
+                    lines.append(
+                        f'{METRIC_NAME}_bucket{{span="{label}",le="{bound}"}} {cumulative}'
+                    )
+                lines.append(f'{METRIC_NAME}_sum{{span="{label}"}} {h.sum!r}')
+                lines.append(f'{METRIC_NAME}_count{{span="{label}"}} {h.count}')
+        return "\n".join(lines) + "\n"
+
+
+TIMINGS = Timings()
+
+
+class _Span:
+    __slots__ = ("name", "start")
+
+    def __init__(self, name):
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        TIMINGS.observe(self.name, time.perf_counter() - self.start)
+        return False
+
+
+def span(name):
+    """Context manager recording the duration of its block under `name`."""
+    return _Span(name) if _enabled else _NO_SPAN
+
+
+def timed(name):
+    """Decorator recording every call of the function under `name`."""
+
+    def decorate(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return fn(*args, **kwargs)
+            start = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                TIMINGS.observe(name, time.perf_counter() - start)
+
+        return wrapper
+
+    return decorate
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split("?")[0] != "/metrics":
+            self.send_error(404)
+            return
+        body = TIMINGS.prometheus_text().encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+_server = None
+_bind_failed = False
+_server_lock = threading.Lock()
+
+
+def serve_metrics(port=None):
+    """
+    Serves the histograms at http://127.0.0.1:<port>/metrics from a daemon
+    thread, port defaulting to SDG_METRICS_PORT. Returns the server, or None
+    when no port is configured or it cannot be bound. Idempotent per process:
+    a failed bind (port taken, e.g. by another server process sharing
+    SDG_METRICS_PORT) is logged once and not retried.
+    """
+    global _server, _bind_failed
+    port = port or os.environ.get("SDG_METRICS_PORT", "").strip()
+    if not port or _server is not None or _bind_failed:
+        return _server
+    with _server_lock:
+        if _server is None and not _bind_failed:
+            try:
+                server = ThreadingHTTPServer(("127.0.0.1", int(port)), _MetricsHandler)
+            except (OSError, ValueError) as e:
+                _bind_failed = True
+                _LOGGER.warning("metrics endpoint not started on port %s: %s", port, e)
+                return None
+            server.daemon_threads = True
+            threading.Thread(
+                target=server.serve_forever, name="sdg-metrics", daemon=True
+            ).start()
+            enable()
+            _server = server
+    return _server
@@ -1,3 +1,5 @@
+import functools
+
 import streamlit as st
 
 
@@ -53,102 +55,122 @@ def get_sdg_colors(sdg):
     )
 
 
-def set_theme(sdg):
-    theme = get_sdg_colors(sdg)
+@functools.lru_cache(maxsize=None)
+def theme_variables(sdg):
+    """
+    The only theme-dependent CSS: the goal's palette as custom properties
+    (--sdg-main, --sdg-border, ...), read by THEME_CSS and the Reference tab.
+    """
+    declarations = "".join(
+        f"--sdg-{key.replace('_', '-')}: {value}; "
+        for key, value in get_sdg_colors(sdg).items()
+    )
+    return f"<style>:root {{ {declarations}}}</style>"
 
-    st.markdown(
-        f"""
+
+# Static stylesheet, byte-identical on every rerun and for every goal. Streamlit
+# sends a repeated element as a hash reference once the browser has it, so a
+# rerun only transmits the small theme_variables() block.
+THEME_CSS = """
     <style>
-    @import url('https://fonts.googleapis.com/css2?family=Inter:wght@300;400;500;600;700;800&display=swap');
+    /* Inter is bundled under static/fonts/ (SIL OFL, see LICENSE.txt there), so
+       offline deployments never wait on a font CDN. */
+    @font-face {
+        font-family: 'Inter';
+        font-style: normal;
+        font-weight: 100 900;
+        font-display: swap;
+        src: local('Inter'), url('app/static/fonts/InterVariable.woff2') format('woff2');
+    }
 
-    *, *::before, *::after {{ font-family: 'Inter', sans-serif !important; }}
+    *, *::before, *::after { font-family: 'Inter', sans-serif !important; }
 
     /* ── BACKGROUND ── */
-    .stApp {{
-        background: linear-gradient(160deg, {theme['bg']} 0%, {theme['bg_end']} 100%);
+    .stApp {
+        background: linear-gradient(160deg, var(--sdg-bg) 0%, var(--sdg-bg-end) 100%);
         background-attachment: fixed;
         min-height: 100vh;
-    }}
-    .stApp::before {{
+    }
+    .stApp::before {
         content: '';
         position: fixed;
         width: 650px; height: 650px;
         border-radius: 50%;
-        background: radial-gradient(circle, {theme['orb']} 0%, transparent 68%);
+        background: radial-gradient(circle, var(--sdg-orb) 0%, transparent 68%);
         top: -200px; right: -200px;
         pointer-events: none;
         z-index: 0;
-    }}
-    .stApp::after {{
+    }
+    .stApp::after {
         content: '';
         position: fixed;
         width: 450px; height: 450px;
         border-radius: 50%;
-        background: radial-gradient(circle, {theme['orb']} 0%, transparent 68%);
+        background: radial-gradient(circle, var(--sdg-orb) 0%, transparent 68%);
         bottom: -120px; left: -120px;
         pointer-events: none;
         z-index: 0;
-    }}
+    }
 
     /* ── MAIN GLASS CONTAINER ── */
-    .block-container {{
+    .block-container {
         background: rgba(255, 255, 255, 0.76);
         backdrop-filter: blur(22px);
         -webkit-backdrop-filter: blur(22px);
-        border: 1px solid {theme['border']};
+        border: 1px solid var(--sdg-border);
         border-radius: 24px;
         padding: 2rem 2.5rem 3rem;
         margin-top: 1rem;
         box-shadow:
-            0 8px 40px rgba({theme['rgb']}, 0.10),
+            0 8px 40px rgba(var(--sdg-rgb), 0.10),
             0 2px 8px rgba(0,0,0,0.06),
             inset 0 1px 0 rgba(255,255,255,0.9);
         position: relative;
         z-index: 1;
-    }}
+    }
 
     /* ── TYPOGRAPHY ── */
-    h1 {{
-        color: {theme['main']} !important;
+    h1 {
+        color: var(--sdg-main) !important;
         font-weight: 800 !important;
         letter-spacing: -0.8px !important;
         line-height: 1.2 !important;
-    }}
-    h2 {{
-        color: {theme['main']} !important;
+    }
+    h2 {
+        color: var(--sdg-main) !important;
         font-weight: 700 !important;
-    }}
-    h3 {{
-        color: {theme['light']} !important;
+    }
+    h3 {
+        color: var(--sdg-light) !important;
         font-weight: 600 !important;
-    }}
+    }
 
     /* ── SIDEBAR ── */
-    [data-testid="stSidebar"] {{
+    [data-testid="stSidebar"] {
         background: rgba(255, 255, 255, 0.68) !important;
         backdrop-filter: blur(20px) !important;
         -webkit-backdrop-filter: blur(20px) !important;
-        border-right: 1px solid {theme['border']} !important;
-        box-shadow: 4px 0 24px rgba({theme['rgb']}, 0.08);
-    }}
+        border-right: 1px solid var(--sdg-border) !important;
+        box-shadow: 4px 0 24px rgba(var(--sdg-rgb), 0.08);
+    }
     [data-testid="stSidebar"] [data-testid="stMarkdownContainer"] h1,
     [data-testid="stSidebar"] [data-testid="stMarkdownContainer"] h2,
-    [data-testid="stSidebar"] [data-testid="stMarkdownContainer"] h3 {{
-        color: {theme['main']} !important;
-    }}
+    [data-testid="stSidebar"] [data-testid="stMarkdownContainer"] h3 {
+        color: var(--sdg-main) !important;
+    }
 
     /* ── TABS ── */
-    .stTabs [data-baseweb="tab-list"] {{
+    .stTabs [data-baseweb="tab-list"] {
         background: rgba(255, 255, 255, 0.55) !important;
         backdrop-filter: blur(12px);
         -webkit-backdrop-filter: blur(12px);
         border-radius: 14px;
         padding: 5px;
         gap: 4px;
-        border: 1px solid {theme['border']};
-        box-shadow: 0 2px 14px rgba({theme['rgb']}, 0.07);
-    }}
-    .stTabs [data-baseweb="tab"] {{
+        border: 1px solid var(--sdg-border);
+        box-shadow: 0 2px 14px rgba(var(--sdg-rgb), 0.07);
+    }
+    .stTabs [data-baseweb="tab"] {
         background: transparent !important;
         color: #666 !important;
         border-radius: 10px !important;
@@ -156,126 +178,129 @@ def set_theme(sdg):
         transition: all 0.22s ease !important;
         padding: 8px 22px !important;
         border: none !important;
-    }}
-    .stTabs [data-baseweb="tab"]:hover {{
-        background: {theme['glass']} !important;
-        color: {theme['main']} !important;
-    }}
-    .stTabs [aria-selected="true"] {{
-        background: rgba({theme['rgb']}, 0.13) !important;
-        color: {theme['main']} !important;
+    }
+    .stTabs [data-baseweb="tab"]:hover {
+        background: var(--sdg-glass) !important;
+        color: var(--sdg-main) !important;
+    }
+    .stTabs [aria-selected="true"] {
+        background: rgba(var(--sdg-rgb), 0.13) !important;
+        color: var(--sdg-main) !important;
         font-weight: 600 !important;
-        box-shadow: 0 2px 10px rgba({theme['rgb']}, 0.18) !important;
-    }}
-    .stTabs [data-baseweb="tab-highlight"] {{
+        box-shadow: 0 2px 10px rgba(var(--sdg-rgb), 0.18) !important;
+    }
+    .stTabs [data-baseweb="tab-highlight"] {
         display: none !important;
-    }}
-    .stTabs [data-baseweb="tab-border"] {{
+    }
+    .stTabs [data-baseweb="tab-border"] {
         display: none !important;
-    }}
+    }
 
     /* ── RADIO BUTTONS ── */
-    div[role="radiogroup"] > label > div:first-child {{
-        background-color: {theme['glass']} !important;
-        border-color: {theme['border']} !important;
-    }}
-    div[role="radiogroup"] > label[data-baseweb="radio"] > div:first-child {{
-        background-color: {theme['main']} !important;
-    }}
+    div[role="radiogroup"] > label > div:first-child {
+        background-color: var(--sdg-glass) !important;
+        border-color: var(--sdg-border) !important;
+    }
+    div[role="radiogroup"] > label[data-baseweb="radio"] > div:first-child {
+        background-color: var(--sdg-main) !important;
+    }
 
     /* ── SLIDER ── */
-    div[data-baseweb="slider"] div[role="slider"] {{
-        background-color: {theme['main']} !important;
-        box-shadow: 0 0 0 4px rgba({theme['rgb']}, 0.2) !important;
-    }}
+    div[data-baseweb="slider"] div[role="slider"] {
+        background-color: var(--sdg-main) !important;
+        box-shadow: 0 0 0 4px rgba(var(--sdg-rgb), 0.2) !important;
+    }
 
     /* ── MULTISELECT TAGS ── */
-    .stMultiSelect span[data-baseweb="tag"] {{
-        background: rgba({theme['rgb']}, 0.10) !important;
-        border: 1px solid {theme['border']} !important;
+    .stMultiSelect span[data-baseweb="tag"] {
+        background: rgba(var(--sdg-rgb), 0.10) !important;
+        border: 1px solid var(--sdg-border) !important;
         border-radius: 8px !important;
-    }}
-    .stMultiSelect span[data-baseweb="tag"] span {{
-        color: {theme['main']} !important;
+    }
+    .stMultiSelect span[data-baseweb="tag"] span {
+        color: var(--sdg-main) !important;
         font-weight: 500 !important;
-    }}
+    }
 
     /* ── SELECT / MULTISELECT INPUT ── */
     .stSelectbox div[data-baseweb="select"] > div,
-    .stMultiSelect div[data-baseweb="select"] > div {{
-        border-color: {theme['border']} !important;
+    .stMultiSelect div[data-baseweb="select"] > div {
+        border-color: var(--sdg-border) !important;
         border-radius: 10px !important;
         background: rgba(255, 255, 255, 0.82) !important;
-    }}
+    }
 
     /* ── METRIC CARDS ── */
-    [data-testid="stMetric"] {{
+    [data-testid="stMetric"] {
         background: rgba(255, 255, 255, 0.72) !important;
         backdrop-filter: blur(12px) !important;
-        border: 1px solid {theme['border']} !important;
+        border: 1px solid var(--sdg-border) !important;
         border-radius: 14px !important;
         padding: 1rem 1.2rem !important;
-        box-shadow: 0 2px 12px rgba({theme['rgb']}, 0.08) !important;
-    }}
-    [data-testid="stMetricValue"] {{
-        color: {theme['main']} !important;
+        box-shadow: 0 2px 12px rgba(var(--sdg-rgb), 0.08) !important;
+    }
+    [data-testid="stMetricValue"] {
+        color: var(--sdg-main) !important;
         font-weight: 700 !important;
-    }}
+    }
 
     /* ── DIVIDER ── */
-    hr {{
-        border-color: {theme['border']} !important;
+    hr {
+        border-color: var(--sdg-border) !important;
         opacity: 0.55;
-    }}
+    }
 
     /* ── PRIMARY BUTTON ── */
-    button[kind="primary"] {{
-        background: linear-gradient(135deg, {theme['main']}, {theme['light']}) !important;
+    button[kind="primary"] {
+        background: linear-gradient(135deg, var(--sdg-main), var(--sdg-light)) !important;
         border: none !important;
         border-radius: 10px !important;
-        box-shadow: 0 4px 16px rgba({theme['rgb']}, 0.30) !important;
+        box-shadow: 0 4px 16px rgba(var(--sdg-rgb), 0.30) !important;
         font-weight: 600 !important;
         transition: transform 0.18s ease, box-shadow 0.18s ease !important;
-    }}
-    button[kind="primary"]:hover {{
+    }
+    button[kind="primary"]:hover {
         transform: translateY(-2px) !important;
-        box-shadow: 0 6px 22px rgba({theme['rgb']}, 0.40) !important;
-    }}
+        box-shadow: 0 6px 22px rgba(var(--sdg-rgb), 0.40) !important;
+    }
 
     /* ── PLOTLY CHART WRAPPER ── */
-    [data-testid="stPlotlyChart"] > div {{
+    [data-testid="stPlotlyChart"] > div {
         background: rgba(255, 255, 255, 0.62) !important;
-        border: 1px solid {theme['border']} !important;
+        border: 1px solid var(--sdg-border) !important;
         border-radius: 18px !important;
         padding: 4px !important;
         backdrop-filter: blur(8px) !important;
         -webkit-backdrop-filter: blur(8px) !important;
-        box-shadow: 0 4px 18px rgba({theme['rgb']}, 0.08) !important;
+        box-shadow: 0 4px 18px rgba(var(--sdg-rgb), 0.08) !important;
         overflow: hidden;
-    }}
+    }
 
     /* ── SUBHEADER LEFT ACCENT ── */
-    [data-testid="stSubheader"] {{
-        color: {theme['main']} !important;
+    [data-testid="stSubheader"] {
+        color: var(--sdg-main) !important;
         font-weight: 700 !important;
-        border-left: 4px solid {theme['main']};
+        border-left: 4px solid var(--sdg-main);
         padding-left: 10px !important;
         margin-bottom: 0.6rem !important;
-    }}
+    }
 
     /* ── ALERT / INFO BOXES ── */
-    [data-testid="stAlert"] {{
+    [data-testid="stAlert"] {
         border-radius: 12px !important;
-        border-left: 4px solid {theme['main']} !important;
-        background: {theme['accent']} !important;
-    }}
+        border-left: 4px solid var(--sdg-main) !important;
+        background: var(--sdg-accent) !important;
+    }
 
     /* ── FOCUS RING ── */
-    *:focus-visible {{
-        outline: 2px solid {theme['main']} !important;
+    *:focus-visible {
+        outline: 2px solid var(--sdg-main) !important;
         outline-offset: 2px;
-    }}
+    }
     </style>
-    """,
-        unsafe_allow_html=True,
-    )
+"""
+
+
+def set_theme(sdg):
+    st.markdown(theme_variables(sdg), unsafe_allow_html=True)
+    st.markdown(THEME_CSS, unsafe_allow_html=True)
@@ -14,8 +14,75 @@ SDG_MAP = {
     ],
 }
 
+# Raw UN indicator code -> app display name (must match SDG_MAP entries)
+CODE_TO_NAME = {
+    "2.1.1": "2.1.1 Prevalence of undernourishment (%)",
+    "2.2.1": "2.2.1 Prevalence of stunting (height for age <-2 SD) (%)",
+    "3.1.1": "3.1.1 Maternal Mortality Ratio (per 100k births)",
+    "3.2.1": "3.2.1 Under-5 Mortality Rate (per 1,000 live births)",
+    "6.1.1": "6.1.1 Proportion of population using safely managed drinking water services (%)",
+    "6.2.1": "6.2.1 Proportion of population using safely managed sanitation services (%)",
+}
+
+# UN SDG API series behind each tracked indicator (used by sdg_sync.py)
+SERIES_CODES = {
+    "2.1.1": "SN_ITK_DEFC",
+    "2.2.1": "SH_STA_STNT",
+    "3.1.1": "SH_STA_MORT",
+    "3.2.1": "SH_DYN_MORT",
+    "6.1.1": "SH_H2O_SAFE",
+    "6.2.1": "SH_SAN_SAFE",
+}
+
+# Country coverage by region
+SOUTH_ASIA = ["India", "Pakistan", "Bangladesh", "Nepal", "Sri Lanka", "Bhutan"]
+SE_ASIA = [
+    "Indonesia",
+    "Viet Nam",
+    "Thailand",
+    "Myanmar",
+    "Malaysia",
+    "Philippines",
+    "Singapore",
+]
+
+# UN M49 codes for the covered countries (display name -> GeoAreaCode)
+GEO_AREA_CODES = {
+    "India": 356,
+    "Pakistan": 586,
+    "Bangladesh": 50,
+    "Nepal": 524,
+    "Sri Lanka": 144,
+    "Bhutan": 64,
+    "Indonesia": 360,
+    "Viet Nam": 704,
+    "Thailand": 764,
+    "Myanmar": 104,
+    "Malaysia": 458,
+    "Philippines": 608,
+    "Singapore": 702,
+}
+
+# ISO 3166 alpha-3 codes, the feature ids of the world outlines (used by geo.py)
+ISO3_CODES = {
+    "India": "IND",
+    "Pakistan": "PAK",
+    "Bangladesh": "BGD",
+    "Nepal": "NPL",
+    "Sri Lanka": "LKA",
+    "Bhutan": "BTN",
+    "Indonesia": "IDN",
+    "Viet Nam": "VNM",
+    "Thailand": "THA",
+    "Myanmar": "MMR",
+    "Malaysia": "MYS",
+    "Philippines": "PHL",
+    "Singapore": "SGP",
+}
+
 # Mapping old names to new names for data compatibility
-# Keys must match exactly what is in the CSV generated by generate_mock_data.py
+# Keys are the indicator names of the former simplified mock dataset (final_sdg_data.csv,
+# since replaced by data/generate_mock_data.py output in the raw export layout)
 INDICATOR_RENAME_MAP = {
     "Prevalence of Undernourishment (%)": "2.1.2 Prevalence of moderate or severe food insecurity (%)",
     "Stunting in Children < 5 Years (%)": "2.2.1 Prevalence of stunting (height for age <-2 SD) (%)",
@@ -25,29 +92,6 @@ INDICATOR_RENAME_MAP = {
     "Open Defecation Practice (%)": "6.2.1 Proportion of population using safely managed sanitation services (%)",
 }
 
-import os
-import base64
-
-
-# Helper to get local asset path
-def get_asset_path(filename):
-    # This assumes running from project root (SDG_Analytics_Project) or appSDG folder
-    # We will return a path relative to the script execution or absolute if safest
-    return os.path.join("appSDG", "assets", filename)
-
-
-def get_img_as_base64(file_path):
-    """
-    Reads an image file and returns a base64 encoded string.
-    """
-    try:
-        with open(file_path, "rb") as f:
-            data = f.read()
-        return base64.b64encode(data).decode()
-    except Exception as e:
-        return ""
-
-
 # Icon Paths (Local Assets)
 ICON_URLS = {
     "SDG 2": "appSDG/assets/sdg2.png",